@@ -1,15 +1,15 @@
 import pygame
 import sys
 import hashlib
+import os
 import numpy as np
 import random
 
-pygame.init()
-pygame.mixer.init()
+from word_index import open_index
+from sha256_crack import CrackJob, CrackPool, default_context
+from sha256_pow import Miner
 
 WIDTH, HEIGHT = 1000, 600
-screen = pygame.display.set_mode((WIDTH, HEIGHT))
-pygame.display.set_caption("SHA-256 Hangman")
 
 DARK_BLUE1 = (5, 10, 30)
 DARK_BLUE2 = (15, 30, 80)
@@ -25,17 +25,12 @@ GREEN = (0, 255, 0)
 RED = (255, 0, 0)
 NEON_GREEN = (57, 255, 20)
 
-title_font = pygame.font.SysFont("arial", 48, bold=True)
-font = pygame.font.SysFont("arial", 32)
-small_font = pygame.font.SysFont("arial", 24)
-hash_font = pygame.font.SysFont("arial", 18)
-info_font = pygame.font.SysFont("arial", 20)
-
 START_SCREEN = 0
 SHA_DESCRIPTION_SCREEN = 1
 HOW_TO_PLAY_SCREEN = 2
 GAME_SCREEN = 3
 RESULT_SCREEN = 4
+MINING_SCREEN = 5
 current_screen = START_SCREEN
 
 current_hash = ""
@@ -84,8 +79,6 @@ class Particle:
         s.fill((*CYBER_BLUE, self.alpha))
         surface.blit(s, (self.x, self.y))
 
-particles = [Particle() for _ in range(50)]
-
 def load_words(filename):
     try:
         with open(filename, "r", encoding="utf-8") as f:
@@ -93,7 +86,19 @@ def load_words(filename):
     except FileNotFoundError:
         return ["apple", "banana", "cherry", "date", "elderberry", "quantum", "firewall", "encryption", "algorithm", "cyberspace"]
 
-texts = load_words("words.txt")
+# --- AI Opponent ---
+# Dictionary attack on the current hash, run in the background each round on
+# helper processes that are started once per session (see main)
+AI_WORKERS = max(1, (os.cpu_count() or 2) - 1)
+crack_pool = None
+ai_opponent = None
+
+# --- Proof of Work ---
+# Bonus round after a game: find a nonce so SHA-256(word + nonce) starts with
+# MINING_BITS zero bits; the search runs in worker processes started from a
+# fresh interpreter, never forked from the running game
+MINING_BITS = 20
+miner = None
 
 def draw_gradient(surface, color1, color2):
     for y in range(HEIGHT):
@@ -104,12 +109,18 @@ def draw_gradient(surface, color1, color2):
         pygame.draw.line(surface, (r, g, b), (0, y), (WIDTH, y))
 
 def generate_question():
-    global current_hash, correct_text, guessed_letters, wrong_guesses, feedback_timer
-    correct_text = random.choice(texts)
-    current_hash = hashlib.sha256(correct_text.encode('utf-8')).hexdigest()
+    global current_hash, correct_text, guessed_letters, wrong_guesses, feedback_timer, ai_opponent
+    if word_index is not None and len(word_index):
+        correct_text, current_hash = word_index.record(random.randrange(len(word_index)))
+    else:
+        correct_text = random.choice(texts)
+        current_hash = hashlib.sha256(correct_text.encode('utf-8')).hexdigest()
     guessed_letters = []
     wrong_guesses = 0
     feedback_timer = 0
+    if ai_opponent is not None:
+        ai_opponent.cancel()
+    ai_opponent = CrackJob(current_hash, texts, pool=crack_pool)
     return current_hash
 
 def draw_cyber_button(rect, text, is_hovered=False):
@@ -232,6 +243,17 @@ def draw_game_screen():
     
     word_surf = font.render(display_word, True, WHITE)
     screen.blit(word_surf, (50, 300))
+
+    if ai_opponent is not None:
+        ai_stats = ai_opponent.stats
+        if ai_opponent.done and ai_opponent.result is not None:
+            ai_text = f"AI opponent cracked the hash in {ai_stats['seconds']:.1f} s"
+        elif ai_opponent.done:
+            ai_text = "AI opponent gave up"
+        else:
+            ai_text = f"AI opponent: {ai_stats['candidates']:,} hashes tried ({ai_stats['rate']:,.0f} H/s)"
+        ai_surf = hash_font.render(ai_text, True, GRAY)
+        screen.blit(ai_surf, (50, 350))
     
     for i in range(wrong_guesses):
         if i < len(hangman_parts):
@@ -310,6 +332,38 @@ def draw_result_screen():
     global exit_button_result
     exit_button_result = pygame.Rect(WIDTH//2 - 100, play_again_button.bottom + 20, 200, 50)
     draw_cyber_button(exit_button_result, "EXIT", exit_button_result.collidepoint(mouse_pos))
+    draw_cyber_button(mine_button, "MINE IT", mine_button.collidepoint(mouse_pos))
+
+def draw_mining_screen():
+    title_surface = title_font.render("PROOF OF WORK", True, WHITE)
+    draw_text_with_glow(screen, "PROOF OF WORK", title_font, WHITE, (WIDTH//2 - title_surface.get_width()//2, 80), CYBER_BLUE)
+
+    goal = info_font.render(f"Find a nonce so SHA-256(\"{correct_text}\" + nonce) starts with {MINING_BITS} zero bits", True, WHITE)
+    screen.blit(goal, (WIDTH//2 - goal.get_width()//2, 170))
+
+    stats = miner.stats
+    lines = [
+        (f"Hashes tried: {stats['hashes']:,}", WHITE),
+        (f"Speed: {stats['rate']:,.0f} hashes/s", WHITE),
+        (f"Best so far: {stats['best_bits']} zero bits (nonce {stats['best_nonce']})", WHITE),
+    ]
+    if miner.nonce is not None:
+        lines.append((f"Found nonce {miner.nonce} in {stats['seconds']:.1f} s", NEON_GREEN))
+        lines.append((miner.digest()[:32] + "...", GRAY))
+    y_offset = 230
+    for line, color in lines:
+        line_surf = small_font.render(line, True, color)
+        screen.blit(line_surf, (WIDTH//2 - line_surf.get_width()//2, y_offset))
+        y_offset += 40
+
+    mouse_pos = pygame.mouse.get_pos()
+    draw_cyber_button(back_button_mining, "BACK", back_button_mining.collidepoint(mouse_pos))
+
+def stop_miner():
+    global miner
+    if miner is not None:
+        miner.cancel()
+        miner = None
 
 # Button definitions
 start_button = pygame.Rect(WIDTH//2 - 100, 320, 200, 50)
@@ -324,132 +378,176 @@ continue_button_how_to_play = pygame.Rect(WIDTH//2 - 100, HEIGHT - 120, 200, 50)
 back_button_how_to_play = pygame.Rect(WIDTH//2 - 100, HEIGHT - 60, 200, 50)  # Adjusted Y position
 
 play_again_button = pygame.Rect(WIDTH//2 - 100, 370, 200, 50)
-
-generate_question()
-
-clock = pygame.time.Clock()
-running = True
-time = 0
-
-while running:
-    dt = clock.tick(60) / 1000
-    time += dt * 5
+mine_button = pygame.Rect(WIDTH//2 - 100, 510, 200, 50)
+back_button_mining = pygame.Rect(WIDTH//2 - 100, HEIGHT - 80, 200, 50)
+
+# The worker processes re-import this file, so everything with side effects
+# (window, fonts, word list, helper processes) happens in main()
+def main():
+    global screen, title_font, font, small_font, hash_font, info_font, particles, texts, word_index, crack_pool
+    global current_screen, feedback, feedback_timer, wrong_guesses, game_result, miner
+
+    texts = load_words("words.txt")
+    # digest -> word index over words.txt, rebuilt only when the file changes
+    word_index = open_index("words.txt") if os.path.exists("words.txt") else None
+    crack_pool = CrackPool(AI_WORKERS)
+
+    pygame.init()
+    pygame.mixer.init()
+    screen = pygame.display.set_mode((WIDTH, HEIGHT))
+    pygame.display.set_caption("SHA-256 Hangman")
+
+    title_font = pygame.font.SysFont("arial", 48, bold=True)
+    font = pygame.font.SysFont("arial", 32)
+    small_font = pygame.font.SysFont("arial", 24)
+    hash_font = pygame.font.SysFont("arial", 18)
+    info_font = pygame.font.SysFont("arial", 20)
+
+    particles = [Particle() for _ in range(50)]
+
+    generate_question()
+
+    clock = pygame.time.Clock()
+    running = True
+    time = 0
+
+    while running:
+        dt = clock.tick(60) / 1000
+        time += dt * 5
     
-    if feedback_timer < feedback_duration:
-        feedback_timer += dt
-    else:
-        feedback = ""
+        if feedback_timer < feedback_duration:
+            feedback_timer += dt
+        else:
+            feedback = ""
 
-    for event in pygame.event.get():
-        if event.type == pygame.QUIT:
-            running = False
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                running = False
         
-        elif event.type == pygame.MOUSEBUTTONDOWN:
-            if current_screen == START_SCREEN:
-                if start_button.collidepoint(event.pos):
-                    current_screen = SHA_DESCRIPTION_SCREEN
-                    feedback = ""
-                elif exit_button.collidepoint(event.pos):
-                    running = False
+            elif event.type == pygame.MOUSEBUTTONDOWN:
+                if current_screen == START_SCREEN:
+                    if start_button.collidepoint(event.pos):
+                        current_screen = SHA_DESCRIPTION_SCREEN
+                        feedback = ""
+                    elif exit_button.collidepoint(event.pos):
+                        running = False
             
-            elif current_screen == SHA_DESCRIPTION_SCREEN:
-                if next_button_sha.collidepoint(event.pos):
-                    current_screen = HOW_TO_PLAY_SCREEN
-                elif back_button_sha.collidepoint(event.pos):
-                    current_screen = START_SCREEN
-
-            elif current_screen == HOW_TO_PLAY_SCREEN:
-                if continue_button_how_to_play.collidepoint(event.pos):
-                    generate_question() 
-                    current_screen = GAME_SCREEN
-                    feedback = ""
-                elif back_button_how_to_play.collidepoint(event.pos):
-                    current_screen = SHA_DESCRIPTION_SCREEN
-
-            elif current_screen == GAME_SCREEN:
-                mouse_pos = pygame.mouse.get_pos()
-                y_pos = 400
-                letter_clicked = None
+                elif current_screen == SHA_DESCRIPTION_SCREEN:
+                    if next_button_sha.collidepoint(event.pos):
+                        current_screen = HOW_TO_PLAY_SCREEN
+                    elif back_button_sha.collidepoint(event.pos):
+                        current_screen = START_SCREEN
+
+                elif current_screen == HOW_TO_PLAY_SCREEN:
+                    if continue_button_how_to_play.collidepoint(event.pos):
+                        generate_question() 
+                        current_screen = GAME_SCREEN
+                        feedback = ""
+                    elif back_button_how_to_play.collidepoint(event.pos):
+                        current_screen = SHA_DESCRIPTION_SCREEN
+
+                elif current_screen == GAME_SCREEN:
+                    mouse_pos = pygame.mouse.get_pos()
+                    y_pos = 400
+                    letter_clicked = None
                 
-                for row_str in ["qwertyuiop", "asdfghjkl", "zxcvbnm"]:
-                    x_pos = 50
-                    for letter in row_str:
-                        rect = pygame.Rect(x_pos, y_pos, 40, 40)
-                        if rect.collidepoint(mouse_pos) and letter not in guessed_letters:
-                            letter_clicked = letter
+                    for row_str in ["qwertyuiop", "asdfghjkl", "zxcvbnm"]:
+                        x_pos = 50
+                        for letter in row_str:
+                            rect = pygame.Rect(x_pos, y_pos, 40, 40)
+                            if rect.collidepoint(mouse_pos) and letter not in guessed_letters:
+                                letter_clicked = letter
+                                break
+                            x_pos += 50
+                        if letter_clicked:
                             break
-                        x_pos += 50
-                    if letter_clicked:
-                        break
-                    y_pos += 50
+                        y_pos += 50
                 
-                if letter_clicked:
-                    guessed_letters.append(letter_clicked)
+                    if letter_clicked:
+                        guessed_letters.append(letter_clicked)
+                        feedback_timer = 0
+                        if letter_clicked in correct_text:
+                            feedback = f"Correct! '{letter_clicked.upper()}' is in the word."
+                            if all(char in guessed_letters for char in correct_text):
+                                game_result = "You Win!"
+                                current_screen = RESULT_SCREEN
+                        else:
+                            wrong_guesses += 1
+                            feedback = f"Wrong! '{letter_clicked.upper()}' is not in the word."
+                            if wrong_guesses >= max_wrong_guesses:
+                                game_result = "Game Over"
+                                current_screen = RESULT_SCREEN
+            
+                elif current_screen == RESULT_SCREEN:
+                    if play_again_button.collidepoint(event.pos):
+                        generate_question()
+                        current_screen = GAME_SCREEN
+                        feedback = ""
+                    elif exit_button_result.collidepoint(event.pos):
+                        running = False
+                    elif mine_button.collidepoint(event.pos):
+                        miner = Miner(correct_text.encode('utf-8'), MINING_BITS, AI_WORKERS, default_context())
+                        current_screen = MINING_SCREEN
+
+                elif current_screen == MINING_SCREEN:
+                    if back_button_mining.collidepoint(event.pos):
+                        stop_miner()
+                        current_screen = RESULT_SCREEN
+        
+            elif event.type == pygame.KEYDOWN and current_screen == GAME_SCREEN:
+                if event.unicode.isalpha() and event.unicode.lower() not in guessed_letters:
+                    letter = event.unicode.lower()
+                    guessed_letters.append(letter)
                     feedback_timer = 0
-                    if letter_clicked in correct_text:
-                        feedback = f"Correct! '{letter_clicked.upper()}' is in the word."
+                    if letter in correct_text:
+                        feedback = f"Correct! '{letter.upper()}' is in the word."
                         if all(char in guessed_letters for char in correct_text):
                             game_result = "You Win!"
                             current_screen = RESULT_SCREEN
                     else:
                         wrong_guesses += 1
-                        feedback = f"Wrong! '{letter_clicked.upper()}' is not in the word."
+                        feedback = f"Wrong! '{letter.upper()}' is not in the word."
                         if wrong_guesses >= max_wrong_guesses:
                             game_result = "Game Over"
                             current_screen = RESULT_SCREEN
-            
-            elif current_screen == RESULT_SCREEN:
-                if play_again_button.collidepoint(event.pos):
-                    generate_question()
-                    current_screen = GAME_SCREEN
-                    feedback = ""
-                elif exit_button_result.collidepoint(event.pos):
-                    running = False
-        
-        elif event.type == pygame.KEYDOWN and current_screen == GAME_SCREEN:
-            if event.unicode.isalpha() and event.unicode.lower() not in guessed_letters:
-                letter = event.unicode.lower()
-                guessed_letters.append(letter)
-                feedback_timer = 0
-                if letter in correct_text:
-                    feedback = f"Correct! '{letter.upper()}' is in the word."
-                    if all(char in guessed_letters for char in correct_text):
-                        game_result = "You Win!"
-                        current_screen = RESULT_SCREEN
-                else:
-                    wrong_guesses += 1
-                    feedback = f"Wrong! '{letter.upper()}' is not in the word."
-                    if wrong_guesses >= max_wrong_guesses:
-                        game_result = "Game Over"
-                        current_screen = RESULT_SCREEN
 
-    draw_gradient(screen, DARK_BLUE1, DARK_BLUE2)
+        draw_gradient(screen, DARK_BLUE1, DARK_BLUE2)
     
-    grid_surf = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
-    for x in range(0, WIDTH, 40):
-        alpha = int(50 + 50 * np.sin(time + x / 100))
-        pygame.draw.line(grid_surf, (*CYBER_BLUE[:3], alpha), (x, 0), (x, HEIGHT))
-    for y in range(0, HEIGHT, 40):
-        alpha = int(50 + 50 * np.sin(time + y / 100))
-        pygame.draw.line(grid_surf, (*CYBER_BLUE[:3], alpha), (0, y), (WIDTH, y))
-    screen.blit(grid_surf, (0, 0))
-
-    for particle in particles:
-        particle.move()
-        particle.draw(screen)
-
-    if current_screen == START_SCREEN:
-        draw_start_screen()
-    elif current_screen == SHA_DESCRIPTION_SCREEN:
-        draw_sha_description_screen()
-    elif current_screen == HOW_TO_PLAY_SCREEN:
-        draw_how_to_play_screen()
-    elif current_screen == GAME_SCREEN:
-        draw_game_screen()
-    elif current_screen == RESULT_SCREEN:
-        draw_result_screen()
-
-    pygame.display.flip()
-
-pygame.quit()
-sys.exit()
\ No newline at end of file
+        grid_surf = pygame.Surface((WIDTH, HEIGHT), pygame.SRCALPHA)
+        for x in range(0, WIDTH, 40):
+            alpha = int(50 + 50 * np.sin(time + x / 100))
+            pygame.draw.line(grid_surf, (*CYBER_BLUE[:3], alpha), (x, 0), (x, HEIGHT))
+        for y in range(0, HEIGHT, 40):
+            alpha = int(50 + 50 * np.sin(time + y / 100))
+            pygame.draw.line(grid_surf, (*CYBER_BLUE[:3], alpha), (0, y), (WIDTH, y))
+        screen.blit(grid_surf, (0, 0))
+
+        for particle in particles:
+            particle.move()
+            particle.draw(screen)
+
+        if current_screen == START_SCREEN:
+            draw_start_screen()
+        elif current_screen == SHA_DESCRIPTION_SCREEN:
+            draw_sha_description_screen()
+        elif current_screen == HOW_TO_PLAY_SCREEN:
+            draw_how_to_play_screen()
+        elif current_screen == GAME_SCREEN:
+            draw_game_screen()
+        elif current_screen == RESULT_SCREEN:
+            draw_result_screen()
+        elif current_screen == MINING_SCREEN:
+            miner.poll()
+            draw_mining_screen()
+
+        pygame.display.flip()
+
+    if ai_opponent is not None:
+        ai_opponent.cancel()
+    stop_miner()
+    crack_pool.close()
+    pygame.quit()
+    sys.exit()
+
+if __name__ == "__main__":
+    main()
@@ -1,22 +1,11 @@
 import random
 import sys
-from sympy import isprime
+from rsa_keys import rsa_keygen
+from prime_table import is_prime, nearest_prime
+from rsa_codec import encrypt_letters
 
 sys.stdout.reconfigure(encoding='utf-8')
 char_map = {chr(i + 65): i for i in range(26)}
-def gcd(a, b):
-    while b:
-        a, b = b, a % b
-    return a
-def rsa_keygen(p, q):
-    n = p * q
-    phi = (p - 1) * (q - 1)
-    e = random.randrange(2, phi)
-    while gcd(e, phi) != 1:
-        e = random.randrange(2, phi)
-    d = pow(e, -1, phi)
-    return n, phi, e, d
-
 def encrypt(m, e, n):
     return pow(m, e, n)
 
@@ -28,8 +17,9 @@ def game():
         try:
             p = int(input("🔢 Enter the first prime number (p): "))
             q = int(input("🔢 Enter the second prime number (q): "))
-            if not (isprime(p) and isprime(q)):
+            if not (is_prime(p) and is_prime(q)):
                 print("❌ One or both numbers are not prime. Please enter valid primes.")
+                print(f"💡 Nearest primes: p → {nearest_prime(p)}, q → {nearest_prime(q)}")
                 continue
             if p == q:
                 print("❌ p and q should not be the same. Try again.")
@@ -52,7 +42,7 @@ def game():
 
 
     m_values = [char_map[char] for char in word]
-    c_values = [encrypt(m, e, n) for m in m_values]
+    c_values = encrypt_letters(m_values, e, n)
 
     print(f"\n📝 Your task: Encrypt the word '{word}' using the public key.")
     print(f"🔓 Use the public exponent e = {e} and n = {n}")
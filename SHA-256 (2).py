@@ -2,16 +2,16 @@ import pygame
 import sys
 import numpy as np
 import random
-import struct
 import logging
+from collections import deque
+from time import perf_counter
 
-# Setup logging
-logging.basicConfig(
-    level=logging.DEBUG,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    filename='game.log',
-    filemode='a'
-)
+from sha256_core import RoundRecorder, sha256_traced, hex_word
+from game_logging import setup_logging
+
+# Setup logging: records go through a queue to a background writer; set
+# SHA_GAME_LOG_LEVEL=DEBUG for the per-keystroke detail
+setup_logging('game.log')
 
 try:
     pygame.init()
@@ -74,6 +74,7 @@ feedback_timer = 0
 feedback_duration = 2
 game_result = ""
 sha_step_answers = {}
+sha_rounds = None
 padding_options = []
 hex_options = {}
 show_correct_answer = False
@@ -144,13 +145,9 @@ def load_words():
 
 texts = load_words()
 
-# --- SHA-256 Helper ---
-def right_rotate(n, b):
-    return ((n >> b) | (n << (32 - b))) & 0xFFFFFFFF
-
 # --- SHA-256 Function ---
 def sha256_full_process_and_capture(message_text):
-    global sha_step_answers
+    global sha_step_answers, sha_rounds
     sha_step_answers = {}
 
     message = message_text.encode('utf-8')
@@ -160,85 +157,19 @@ def sha256_full_process_and_capture(message_text):
     else:
         sha_step_answers[0] = ""
 
-    h_initial = [
-        0x6a09e667, 0xbb67ae85, 0x3c6ef372, 0xa54ff53a,
-        0x510e527f, 0x9b05688c, 0x1f83d9ab, 0x5be0cd19
-    ]
-
-    k = [
-        0x428a2f98, 0x71374491, 0xb5c0fbcf, 0xe9b5dba5, 0x3956c25b, 0x59f111f1, 0x923f82a4, 0xab1c5ed5,
-        0xd807aa98, 0x12835b01, 0x243185be, 0x550c7dc3, 0x72be5d74, 0x80deb1fe, 0x9bdc06a7, 0xc19bf174,
-        0xe49b69c1, 0xefbe4786, 0x0fc19dc6, 0x240ca1cc, 0x2de92c6f, 0x4a7484aa, 0x5cb0a9dc, 0x76f988da,
-        0x983e5152, 0xa831c66d, 0xb00327c8, 0xbf597fc7, 0xc6e00bf3, 0xd5a79147, 0x06ca6351, 0x14292967,
-        0x27b70a85, 0x2e1b2138, 0x4d2c6dfc, 0x53380d13, 0x650a7354, 0x766a0abb, 0x81c2c92e, 0x92722c85,
-        0xa2bfe8a1, 0xa81a664b, 0xc24b8b70, 0xc76c51a3, 0xd192e819, 0xd6990624, 0xf40e3585, 0x106aa070,
-        0x19a4c116, 0x1e376c08, 0x2748774c, 0x34b0bcb5, 0x391c0cb3, 0x4ed8aa4a, 0x5b9cca4f, 0x682e6ff3,
-        0x748f82ee, 0x78a5636f, 0x84c87814, 0x8cc70208, 0x90befffa, 0xa4506ceb, 0xbef9a3f7, 0xc67178f2
-    ]
-
     original_length_bits = len(message) * 8
-    padded_message = message + b'\x80'
     sha_step_answers[1] = ''.join(format(byte, '08b') for byte in message) + '1'
-    current_length_bits = len(padded_message) * 8
+    current_length_bits = (len(message) + 1) * 8
     correct_zeros = (448 - (current_length_bits % 512)) % 512
     sha_step_answers[2] = correct_zeros
-
-    while (len(padded_message) * 8) % 512 != 448:
-        padded_message += b'\x00'
-
-    padded_message += struct.pack('>Q', original_length_bits)
     sha_step_answers[3] = format(original_length_bits, '016x')
 
-    h = h_initial.copy()
-    final_hash_output = ""
-
-    for chunk_start in range(0, len(padded_message), 64):
-        chunk = padded_message[chunk_start:chunk_start + 64]
-        w = list(struct.unpack('>16I', chunk)) + [0] * 48
-
-        if chunk_start == 0:
-            sha_step_answers[4] = format(w[0], '08x')
-
-        for i in range(16, 64):
-            s0 = (right_rotate(w[i-15], 7) ^ right_rotate(w[i-15], 18) ^ (w[i-15] >> 3))
-            s1 = (right_rotate(w[i-2], 17) ^ right_rotate(w[i-2], 19) ^ (w[i-2] >> 10))
-            w[i] = (w[i-16] + s0 + w[i-7] + s1) & 0xFFFFFFFF
-
-            if i == 16 and chunk_start == 0:
-                sha_step_answers[5] = format(w[16], '08x')
-
-        a, b, c, d, e, f, g, hh = h[:]
-
-        for i in range(64):
-            S1 = (right_rotate(e, 6) ^ right_rotate(e, 11) ^ right_rotate(e, 25))
-            ch = (e & f) ^ ((~e) & g)
-            temp1 = (hh + S1 + ch + k[i] + w[i]) & 0xFFFFFFFF
-            S0 = (right_rotate(a, 2) ^ right_rotate(a, 13) ^ right_rotate(a, 22))
-            maj = (a & b) ^ (a & c) ^ (b & c)
-            temp2 = (S0 + maj) & 0xFFFFFFFF
-
-            hh = g
-            g = f
-            f = e
-            e = (d + temp1) & 0xFFFFFFFF
-            d = c
-            c = b
-            b = a
-            a = (temp1 + temp2) & 0xFFFFFFFF
-
-            if i == 0 and chunk_start == 0:
-                sha_step_answers[6] = format(a, '08x')
-
-        h[0] = (h[0] + a) & 0xFFFFFFFF
-        h[1] = (h[1] + b) & 0xFFFFFFFF
-        h[2] = (h[2] + c) & 0xFFFFFFFF
-        h[3] = (h[3] + d) & 0xFFFFFFFF
-        h[4] = (h[4] + e) & 0xFFFFFFFF
-        h[5] = (h[5] + f) & 0xFFFFFFFF
-        h[6] = (h[6] + g) & 0xFFFFFFFF
-        h[7] = (h[7] + hh) & 0xFFFFFFFF
-
-    final_hash_output = "".join(f'{x:08x}' for x in h)
+    # Every schedule word and round state of every block is kept in sha_rounds
+    sha_rounds = RoundRecorder()
+    final_hash_output = sha256_traced(message, sha_rounds).hex()
+    sha_step_answers[4] = hex_word(sha_rounds.word(0, 0))
+    sha_step_answers[5] = hex_word(sha_rounds.word(0, 16))
+    sha_step_answers[6] = hex_word(sha_rounds.state(0, 0)[0])
     sha_step_answers[7] = final_hash_output
     return final_hash_output
 
@@ -277,8 +208,9 @@ def generate_question():
         random.shuffle(options)
         hex_options[step] = options
 
-    logging.info(f"Generated question with word: {correct_text}, hash: {current_hash}, padding options: {tuple(padding_options)}, hex_options: {hex_options}")
-    logging.debug(f"SHA Step Answers: {sha_step_answers}")
+    logging.info("Generated question with word: %s, hash: %s", correct_text, current_hash)
+    logging.debug("Padding options: %s, hex_options: %s", tuple(padding_options), hex_options)
+    logging.debug("SHA Step Answers: %s", sha_step_answers)
     return current_hash
 
 def get_correct_answer(step):
@@ -288,7 +220,7 @@ def validate_input(step, user_input_raw):
     correct_answer = get_correct_answer(step)
     user_input = str(user_input_raw).strip().lower()
 
-    logging.debug(f"Validating Step {step}: Input: '{user_input}', Correct: '{correct_answer}'")
+    logging.debug("Validating Step %s: Input: '%s', Correct: '%s'", step, user_input, correct_answer)
 
     if step in [0, 1]:
         return user_input == correct_answer
@@ -456,7 +388,7 @@ def draw_game_screen():
                     pygame.draw.line(screen, WHITE, part[0], part[1], 3)
             else:  # Circle (head)
                 pygame.draw.circle(screen, WHITE, part[0], part[1], 3)
-            logging.debug(f"Drew hangman part {i+1}/{len(hangman_parts)}")
+            logging.debug("Drew hangman part %d/%d", i + 1, len(hangman_parts))
     except Exception as e:
         logging.error(f"Error drawing hangman part {i+1}: {e}")
 
@@ -553,9 +485,12 @@ generate_question()
 clock = pygame.time.Clock()
 running = True
 time = 0.0
+# Work time per frame (event handling + drawing, not the tick sleep), last minute at 60 FPS
+frame_times = deque(maxlen=3600)
 
 while running:
     dt = clock.tick(60) / 1000
+    frame_start = perf_counter()
     time += dt * 5
 
     if current_screen == TRANSITION_SCREEN:
@@ -729,10 +664,10 @@ while running:
                         feedback_timer = 0
                     elif event.key == pygame.K_BACKSPACE:
                         user_input = user_input[:-1]
-                        logging.debug(f"Backspace pressed, user_input: {user_input}")
+                        logging.debug("Backspace pressed, user_input: %s", user_input)
                     elif event.unicode.isprintable():
                         user_input += event.unicode
-                        logging.debug(f"Key pressed, user_input: {user_input}")
+                        logging.debug("Key pressed, user_input: %s", user_input)
                 except Exception as e:
                     logging.error(f"Error processing keyboard input in GAME_SCREEN: {e}")
 
@@ -775,5 +710,13 @@ while running:
         logging.error(f"Error in main game loop: {e}")
         running = False
 
+    frame_times.append(perf_counter() - frame_start)
+
+if frame_times:
+    ordered = sorted(frame_times)
+    frame_summary = (f"Frame time over {len(ordered)} frames: mean {sum(ordered) / len(ordered) * 1000:.2f} ms, "
+                     f"p99 {ordered[int(len(ordered) * 0.99)] * 1000:.2f} ms, max {ordered[-1] * 1000:.2f} ms")
+    logging.info(frame_summary)
+
 pygame.quit()
 sys.exit()
\ No newline at end of file
@@ -0,0 +1,162 @@
+import atexit
+import logging
+import logging.handlers
+import os
+import queue
+import time
+
+# --- Settings ---
+# SHA_GAME_LOG_LEVEL picks the level (DEBUG, INFO, ...); SHA_GAME_LOG_SYNC=1
+# restores the old synchronous file handler for before/after comparisons.
+LEVEL_ENV = "SHA_GAME_LOG_LEVEL"
+SYNC_ENV = "SHA_GAME_LOG_SYNC"
+DEFAULT_LEVEL = logging.INFO
+LOG_FORMAT = '%(asctime)s - %(levelname)s - %(message)s'
+MAX_BYTES = 1 << 20
+BACKUP_COUNT = 3
+BATCH_SIZE = 256
+RATE_LIMIT = 200  # records per second let through from the game thread
+
+
+class RateLimitFilter(logging.Filter):
+    # Token bucket; a keystroke storm or a per-frame debug line cannot flood
+    # the queue. Errors always pass.
+    def __init__(self, rate=RATE_LIMIT):
+        super().__init__()
+        self.rate = rate
+        self.tokens = float(rate)
+        self.last = time.monotonic()
+        self.dropped = 0
+
+    def filter(self, record):
+        if record.levelno >= logging.ERROR:
+            return True
+        now = time.monotonic()
+        self.tokens = min(self.rate, self.tokens + (now - self.last) * self.rate)
+        self.last = now
+        if self.tokens < 1:
+            self.dropped += 1
+            return False
+        self.tokens -= 1
+        return True
+
+
+class BatchedRotatingFileHandler(logging.handlers.RotatingFileHandler):
+    # emit() normally flushes after every record; here the listener flushes
+    # once per batch instead
+    def flush(self):
+        pass
+
+    def flush_batch(self):
+        super().flush()
+
+
+class GameQueueHandler(logging.handlers.QueueHandler):
+    # The stock prepare() copies the record and runs the full formatter
+    # (timestamps included) on the calling thread. Here the record is queued
+    # as is, with only the arguments merged; the listener formats it from
+    # record.created all the same. This handler is the root logger's only one,
+    # so nothing else sees the record after it is changed.
+    def prepare(self, record):
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+class BatchingQueueListener(logging.handlers.QueueListener):
+    def __init__(self, log_queue, *handlers, batch_size=BATCH_SIZE):
+        super().__init__(log_queue, *handlers, respect_handler_level=True)
+        self.batch_size = batch_size
+        self._pending = 0
+
+    def _flush(self):
+        for handler in self.handlers:
+            getattr(handler, "flush_batch", handler.flush)()
+        self._pending = 0
+
+    def dequeue(self, block):
+        # Flush when the queue runs dry or a batch fills up, so a burst of
+        # records costs one write instead of one per record
+        try:
+            record = self.queue.get_nowait()
+        except queue.Empty:
+            if self._pending:
+                self._flush()
+            record = self.queue.get(block)
+        self._pending += 1
+        if self._pending >= self.batch_size:
+            self._flush()
+        # Formatting a backlog holds the GIL; without this the game thread can
+        # wait out a whole switch interval (5 ms) behind the writer
+        time.sleep(0)
+        return record
+
+    def stop(self):
+        if self._thread is not None:
+            super().stop()
+            self._flush()
+
+
+def _level_from_env(default):
+    name = os.environ.get(LEVEL_ENV, "").upper()
+    level = logging.getLevelName(name) if name else default
+    return level if isinstance(level, int) else default
+
+
+def setup_logging(filename='game.log', level=None):
+    # Returns the background listener (None in synchronous mode); it is
+    # stopped and drained automatically at exit
+    level = _level_from_env(DEFAULT_LEVEL) if level is None else level
+    root = logging.getLogger()
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+    root.setLevel(level)
+
+    if os.environ.get(SYNC_ENV) == "1":
+        handler = logging.FileHandler(filename, mode='a')
+        handler.setFormatter(logging.Formatter(LOG_FORMAT))
+        root.addHandler(handler)
+        return None
+
+    file_handler = BatchedRotatingFileHandler(filename, mode='a', maxBytes=MAX_BYTES, backupCount=BACKUP_COUNT)
+    file_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+    log_queue = queue.SimpleQueue()
+    queue_handler = GameQueueHandler(log_queue)
+    queue_handler.addFilter(RateLimitFilter())
+    root.addHandler(queue_handler)
+    listener = BatchingQueueListener(log_queue, file_handler)
+    listener.start()
+    atexit.register(listener.stop)
+    return listener
+
+
+if __name__ == "__main__":
+    import argparse
+    import statistics
+    import tempfile
+
+    parser = argparse.ArgumentParser(description="Caller-side cost of a log call: synchronous file handler versus queue")
+    parser.add_argument("--records", type=int, default=20000)
+    args = parser.parse_args()
+
+    options = {i: [format(word, '08x') for word in range(4)] for i in range(2, 8)}
+    with tempfile.TemporaryDirectory() as tmp:
+        for mode, sync, level in (("sync, DEBUG", "1", logging.DEBUG), ("queue, DEBUG", "0", logging.DEBUG), ("queue, default", "0", None)):
+            os.environ[SYNC_ENV] = sync
+            listener = setup_logging(os.path.join(tmp, "game.log"), level)
+            # Lift the rate limit so every mode writes every enabled record
+            logging.getLogger().handlers[0].filters.clear()
+            samples = []
+            for i in range(args.records):
+                t0 = time.perf_counter()
+                logging.debug("Generated question %d, hex_options: %s", i, options)
+                samples.append(time.perf_counter() - t0)
+            if listener is not None:
+                listener.stop()
+            samples.sort()
+            print(f"{mode:>15}: mean {statistics.mean(samples) * 1e6:.1f} us, "
+                  f"p99 {samples[int(len(samples) * 0.99)] * 1e6:.1f} us, max {samples[-1] * 1e6:.0f} us per call")
+            logging.getLogger().handlers.clear()
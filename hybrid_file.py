@@ -0,0 +1,195 @@
+import hashlib
+import hmac
+import os
+import struct
+
+from rsa_codec import encrypt_message, decrypt_message
+
+try:
+    from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+except ImportError:
+    AESGCM = None
+
+# --- File format ---
+# header: magic, cipher id, chunk size, nonce (16), wrapped key length, RSA-wrapped session secret
+# chunk:  length (u32), final flag (u8), ciphertext, tag
+# Every tag covers the nonce, chunk counter and final flag, so chunks cannot be
+# reordered, dropped or truncated off the end without failing verification.
+MAGIC = b"HYB1"
+HEADER = struct.Struct(">4sBI16sH")
+CHUNK_HEADER = struct.Struct(">IB")
+DEFAULT_CHUNK_SIZE = 1 << 20
+
+CIPHER_SHAKE = 1   # SHAKE-256 keystream + HMAC-SHA256, standard library only
+CIPHER_AESGCM = 2  # AES-256-GCM, needs the `cryptography` package
+DEFAULT_CIPHER = CIPHER_AESGCM if AESGCM is not None else CIPHER_SHAKE
+
+
+def _derive(secret, label):
+    return hashlib.sha256(label + secret).digest()
+
+
+class _ShakeCipher:
+    tag_size = 32
+
+    def __init__(self, secret, nonce):
+        self.enc_key = _derive(secret, b"enc")
+        self.mac_key = _derive(secret, b"mac")
+        self.nonce = nonce
+
+    def _keystream_xor(self, counter, data):
+        stream = hashlib.shake_256(self.enc_key + self.nonce + counter.to_bytes(8, 'big')).digest(len(data))
+        return (int.from_bytes(data, 'little') ^ int.from_bytes(stream, 'little')).to_bytes(len(data), 'little')
+
+    def _tag(self, counter, final, ciphertext):
+        mac = hmac.new(self.mac_key, self.nonce + counter.to_bytes(8, 'big') + bytes([final]), hashlib.sha256)
+        mac.update(ciphertext)
+        return mac.digest()
+
+    def seal(self, counter, final, data):
+        ciphertext = self._keystream_xor(counter, data)
+        return ciphertext + self._tag(counter, final, ciphertext)
+
+    def open(self, counter, final, sealed):
+        ciphertext, tag = sealed[:-self.tag_size], sealed[-self.tag_size:]
+        if not hmac.compare_digest(tag, self._tag(counter, final, ciphertext)):
+            raise ValueError("chunk authentication failed")
+        return self._keystream_xor(counter, ciphertext)
+
+
+class _AESGCMCipher:
+    tag_size = 16
+
+    def __init__(self, secret, nonce):
+        if AESGCM is None:
+            raise RuntimeError("this file was encrypted with AES-GCM; install the 'cryptography' package")
+        self.aead = AESGCM(_derive(secret, b"enc"))
+        self.nonce = nonce[:4]
+
+    def seal(self, counter, final, data):
+        return self.aead.encrypt(self.nonce + counter.to_bytes(8, 'big'), bytes(data), bytes([final]))
+
+    def open(self, counter, final, sealed):
+        try:
+            return self.aead.decrypt(self.nonce + counter.to_bytes(8, 'big'), bytes(sealed), bytes([final]))
+        except Exception:
+            raise ValueError("chunk authentication failed") from None
+
+
+CIPHERS = {CIPHER_SHAKE: _ShakeCipher, CIPHER_AESGCM: _AESGCMCipher}
+
+
+# --- Streaming ---
+def _fill(src, buf):
+    # readinto may return short counts on pipes; keep going until full or EOF
+    view = memoryview(buf)
+    filled = 0
+    while filled < len(buf):
+        count = src.readinto(view[filled:])
+        if not count:
+            break
+        filled += count
+    return filled
+
+
+def encrypt_chunks(src, e, n, chunk_size=DEFAULT_CHUNK_SIZE, cipher_id=DEFAULT_CIPHER):
+    secret = os.urandom(32)
+    nonce = os.urandom(16)
+    wrapped = encrypt_message(secret, e, n)
+    yield HEADER.pack(MAGIC, cipher_id, chunk_size, nonce, len(wrapped)) + wrapped
+
+    cipher = CIPHERS[cipher_id](secret, nonce)
+    # Two buffers: one chunk of lookahead tells us which chunk is the last
+    current, ahead = bytearray(chunk_size), bytearray(chunk_size)
+    filled = _fill(src, current)
+    counter = 0
+    while True:
+        next_filled = _fill(src, ahead) if filled == chunk_size else 0
+        final = 1 if not next_filled else 0
+        sealed = cipher.seal(counter, final, memoryview(current)[:filled])
+        yield CHUNK_HEADER.pack(filled, final) + sealed
+        if final:
+            return
+        counter += 1
+        current, ahead = ahead, current
+        filled = next_filled
+
+
+def _read_exact(src, size):
+    data = src.read(size)
+    if len(data) != size:
+        raise ValueError("truncated file")
+    return data
+
+
+def decrypt_chunks(src, key):
+    magic, cipher_id, chunk_size, nonce, wrapped_length = HEADER.unpack(_read_exact(src, HEADER.size))
+    if magic != MAGIC or cipher_id not in CIPHERS:
+        raise ValueError("not a hybrid-encrypted file")
+    secret = decrypt_message(_read_exact(src, wrapped_length), key)
+    cipher = CIPHERS[cipher_id](secret, nonce)
+    counter = 0
+    while True:
+        length, final = CHUNK_HEADER.unpack(_read_exact(src, CHUNK_HEADER.size))
+        if length > chunk_size:
+            raise ValueError("chunk larger than the declared chunk size")
+        yield cipher.open(counter, final, _read_exact(src, length + cipher.tag_size))
+        if final:
+            return
+        counter += 1
+
+
+def encrypt_file(in_path, out_path, e, n, chunk_size=DEFAULT_CHUNK_SIZE, cipher_id=DEFAULT_CIPHER):
+    with open(in_path, "rb", buffering=0) as src, open(out_path, "wb") as dst:
+        for record in encrypt_chunks(src, e, n, chunk_size, cipher_id):
+            dst.write(record)
+
+
+def decrypt_file(in_path, out_path, key):
+    # Plaintext is written as chunks verify; on failure the partial output is removed
+    try:
+        with open(in_path, "rb") as src, open(out_path, "wb") as dst:
+            for chunk in decrypt_chunks(src, key):
+                dst.write(chunk)
+    except ValueError:
+        os.remove(out_path)
+        raise
+
+
+if __name__ == "__main__":
+    import argparse
+    import tempfile
+    import time
+    from rsa_keys import generate_keypair
+
+    parser = argparse.ArgumentParser(description="Benchmark hybrid RSA + chunked symmetric file encryption")
+    parser.add_argument("--size-mb", type=int, default=256)
+    parser.add_argument("--chunk-kb", type=int, default=DEFAULT_CHUNK_SIZE // 1024)
+    parser.add_argument("--cipher", choices=["shake", "aesgcm"], default="aesgcm" if DEFAULT_CIPHER == CIPHER_AESGCM else "shake")
+    args = parser.parse_args()
+
+    cipher_id = CIPHER_AESGCM if args.cipher == "aesgcm" else CIPHER_SHAKE
+    key = generate_keypair(2048)
+    with tempfile.TemporaryDirectory() as tmp:
+        plain, sealed, opened = (os.path.join(tmp, name) for name in ("plain", "sealed", "opened"))
+        with open(plain, "wb") as f:
+            block = os.urandom(1 << 20)
+            for _ in range(args.size_mb):
+                f.write(block)
+
+        t0 = time.perf_counter()
+        encrypt_file(plain, sealed, key.e, key.n, args.chunk_kb * 1024, cipher_id)
+        enc = time.perf_counter() - t0
+        t0 = time.perf_counter()
+        decrypt_file(sealed, opened, key)
+        dec = time.perf_counter() - t0
+
+        with open(plain, "rb") as a, open(opened, "rb") as b:
+            while True:
+                x, y = a.read(1 << 20), b.read(1 << 20)
+                if x != y:
+                    raise AssertionError("round trip mismatch")
+                if not x:
+                    break
+        print(f"{args.size_mb} MiB with {args.cipher}, {args.chunk_kb} KiB chunks: "
+              f"encrypt {args.size_mb / enc:.1f} MiB/s, decrypt {args.size_mb / dec:.1f} MiB/s")
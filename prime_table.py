@@ -0,0 +1,146 @@
+import math
+import mmap
+import os
+import struct
+
+from rsa_keys import DETERMINISTIC_LIMIT, is_bpsw_prime, is_probable_prime
+
+# --- File layout ---
+# header: magic, bound (u64); then one bit per odd number, bit i of the
+# bitmap standing for 2*i + 1 (little-endian bit order within each byte)
+MAGIC = b"PRIMEBIT"
+HEADER = struct.Struct(">8sQ")
+DEFAULT_BOUND = 1 << 24
+DEFAULT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "primes.bin")
+
+
+def build_bitmap(bound):
+    # Odd-only byte sieve: slot i is 2*i + 1
+    slots = (bound + 1) // 2
+    sieve = bytearray([1]) * slots
+    sieve[0] = 0
+    for i in range(1, (math.isqrt(bound) + 1) // 2):
+        if sieve[i]:
+            p = 2 * i + 1
+            start = p * p // 2
+            sieve[start::p] = bytes(len(range(start, slots, p)))
+    sieve += bytes(-len(sieve) % 8)
+    # Pack eight 0/1 bytes into one: byte slices taken with stride 8 become
+    # big integers whose bytes are 0 or 1, so shifting by k never carries
+    packed = 0
+    for k in range(8):
+        packed |= int.from_bytes(sieve[k::8], 'little') << k
+    return packed.to_bytes(len(sieve) // 8, 'little')
+
+
+def write_table(path, bound):
+    bitmap = build_bitmap(bound)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, bound))
+        f.write(bitmap)
+    os.replace(tmp_path, path)
+
+
+def _read_bound(path):
+    try:
+        with open(path, "rb") as f:
+            magic, bound = HEADER.unpack(f.read(HEADER.size))
+    except (OSError, struct.error):
+        return None
+    return bound if magic == MAGIC else None
+
+
+class PrimeTable:
+    def __init__(self, path=DEFAULT_PATH, bound=DEFAULT_BOUND):
+        if _read_bound(path) != bound:
+            write_table(path, bound)
+        self.bound = bound
+        self._file = open(path, "rb")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def _bit(self, n):
+        i = n >> 1
+        return (self._map[HEADER.size + (i >> 3)] >> (i & 7)) & 1
+
+    def is_prime(self, n):
+        if n > self.bound:
+            # The fixed Miller-Rabin bases are exact below DETERMINISTIC_LIMIT;
+            # beyond it is_probable_prime switches to random bases, so use
+            # Baillie-PSW to keep every answer repeatable
+            if n < DETERMINISTIC_LIMIT:
+                return is_probable_prime(n)
+            return is_bpsw_prime(n)
+        if n < 3:
+            return n == 2
+        return n & 1 == 1 and self._bit(n) == 1
+
+    def next_prime(self, n):
+        if n < 2:
+            return 2
+        candidate = n + 1 if n % 2 == 0 else n + 2
+        while not self.is_prime(candidate):
+            candidate += 2
+        return candidate
+
+    def previous_prime(self, n):
+        if n <= 2:
+            return None
+        if n == 3:
+            return 2
+        candidate = n - 1 if n % 2 == 0 else n - 2
+        while not self.is_prime(candidate):
+            candidate -= 2
+        return candidate
+
+    def nearest_prime(self, n):
+        if self.is_prime(n):
+            return n
+        below = self.previous_prime(n)
+        above = self.next_prime(n)
+        if below is None or above - n < n - below:
+            return above
+        return below
+
+    def close(self):
+        self._map.close()
+        self._file.close()
+
+
+_default_table = None
+
+
+def default_table():
+    global _default_table
+    if _default_table is None:
+        _default_table = PrimeTable()
+    return _default_table
+
+
+def is_prime(n):
+    return default_table().is_prime(n)
+
+
+def nearest_prime(n):
+    return default_table().nearest_prime(n)
+
+
+if __name__ == "__main__":
+    import argparse
+    import time
+
+    parser = argparse.ArgumentParser(description="Build the prime bitmap and time lookups")
+    parser.add_argument("--bound", type=int, default=DEFAULT_BOUND)
+    parser.add_argument("--path", default=DEFAULT_PATH)
+    parser.add_argument("--rebuild", action="store_true")
+    args = parser.parse_args()
+
+    if args.rebuild and os.path.exists(args.path):
+        os.remove(args.path)
+    t0 = time.perf_counter()
+    table = PrimeTable(args.path, args.bound)
+    print(f"table up to {table.bound} ready in {(time.perf_counter() - t0) * 1000:.1f} ms ({os.path.getsize(args.path)} bytes)")
+    numbers = range(args.bound - 100000, args.bound)
+    t0 = time.perf_counter()
+    count = sum(1 for n in numbers if table.is_prime(n))
+    print(f"{len(numbers)} lookups in {(time.perf_counter() - t0) * 1000:.1f} ms, {count} primes")
@@ -1,7 +1,9 @@
 import pygame
 import sys
 import random
-from sympy import isprime
+from rsa_keys import rsa_keygen
+from prime_table import is_prime, nearest_prime
+from rsa_codec import encrypt_letters
 
 
 pygame.init()
@@ -102,20 +104,6 @@ streams = [BinaryStream() for _ in range(80)]
 stars = [Star() for _ in range(50)]
 
 
-def gcd(a, b):
-    while b:
-        a, b = b, a % b
-    return a
-
-def rsa_keygen(p, q):
-    n = p * q
-    phi = (p - 1) * (q - 1)
-    e = random.randrange(2, phi)
-    while gcd(e, phi) != 1:
-        e = random.randrange(2, phi)
-    d = pow(e, -1, phi)
-    return n, phi, e, d
-
 def encrypt(m, e, n):
     return pow(m, e, n)
 
@@ -126,13 +114,13 @@ def prepare_encryption_game():
     global current_word, m_values, c_values
     current_word = random.choice(word_list)
     m_values = [char_map[ch] for ch in current_word]
-    c_values = [encrypt(m, e, n) for m in m_values]
+    c_values = encrypt_letters(m_values, e, n)
 
 def prepare_decryption_game():
     global current_word, m_values, c_values
     current_word = random.choice(word_list)
     m_values = [char_map[ch] for ch in current_word]
-    c_values = [encrypt(m, e, n) for m in m_values]
+    c_values = encrypt_letters(m_values, e, n)
 
 def reset_all():
     global input_text, message, attempts, user_p, user_q, n, phi, e, d
@@ -391,8 +379,8 @@ while running:
                             message = "Please enter a valid integer."
                         else:
                             val = int(input_text)
-                            if not isprime(val):
-                                message = "Number is not prime."
+                            if not is_prime(val):
+                                message = f"Number is not prime. Nearest prime: {nearest_prime(val)}"
                             else:
                                 if state == "prime_input_p":
                                     user_p = val
@@ -502,8 +490,8 @@ while running:
                         message = "Please enter a valid integer."
                     else:
                         val = int(input_text)
-                        if not isprime(val):
-                            message = "Number is not prime."
+                        if not is_prime(val):
+                            message = f"Number is not prime. Nearest prime: {nearest_prime(val)}"
                         else:
                             if state == "prime_input_p":
                                 user_p = val
@@ -0,0 +1,180 @@
+import math
+import sys
+import time
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+# --- Reading moduli ---
+def read_moduli(path):
+    # One modulus per line, decimal or 0x-prefixed hex; '#' starts a comment
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            line = line.split("#", 1)[0].strip()
+            if line:
+                yield int(line, 0)
+
+
+def peak_memory_mb():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+# --- Batch GCD ---
+# With gmpy2 the product/remainder trees run on GMP's subquadratic
+# arithmetic and Bernstein's algorithm is quasi-linear. CPython's own ints
+# divide in quadratic time, which makes the top of the remainder tree slower
+# than plain pairwise gcd, so without gmpy2 the moduli are reduced against
+# fixed-size batch products instead.
+try:
+    from gmpy2 import mpz
+except ImportError:
+    mpz = None
+
+BATCH_SIZE = 256
+
+
+def product_tree(leaves):
+    levels = [list(leaves)]
+    while len(levels[-1]) > 1:
+        level = levels[-1]
+        levels.append([level[i] * level[i + 1] if i + 1 < len(level) else level[i] for i in range(0, len(level), 2)])
+    return levels
+
+
+def tree_gcd(moduli):
+    # Bernstein: reduce the full product mod N^2 down the tree, then
+    # gcd(n, (P mod n^2) / n) = gcd(n, P / n)
+    levels = product_tree(moduli)
+    remainders = levels.pop()
+    # Walk down the tree freeing levels as we go
+    while levels:
+        level = levels.pop()
+        remainders = [remainders[i // 2] % (node * node) for i, node in enumerate(level)]
+    return [math.gcd(int(r // n), int(n)) for r, n in zip(remainders, moduli)]
+
+
+def batched_gcd(moduli, batch_size=BATCH_SIZE):
+    # Same result as tree_gcd. Each modulus is reduced against the products of
+    # its own batch and every later batch only, accumulating mod n; a shared
+    # prime with an earlier batch always shows up in that earlier modulus's
+    # partial gcd, so one final pass against those partial gcds completes it.
+    count = len(moduli)
+    acc = [1] * count
+    for start in range(0, count, batch_size):
+        end = min(start + batch_size, count)
+        product = math.prod(moduli[start:end])
+        for i in range(end):
+            n = moduli[i]
+            if i >= start:
+                r = (product % (n * n)) // n
+            else:
+                r = product % n
+            acc[i] = acc[i] * r % n
+    partial = [math.gcd(a, n) for a, n in zip(acc, moduli)]
+    shared = math.prod(g for g in partial if g > 1)
+    if shared == 1:
+        return partial
+    return [math.gcd(n, g * (shared % n)) for g, n in zip(partial, moduli)]
+
+
+def batch_gcd(moduli):
+    moduli = list(moduli)
+    if len(moduli) < 2:
+        return [1] * len(moduli)
+    if mpz is not None:
+        return tree_gcd([mpz(n) for n in moduli])
+    return batched_gcd(moduli)
+
+
+def audit(moduli):
+    moduli = list(moduli)
+    gcds = batch_gcd(moduli)
+    flagged = [i for i, g in enumerate(gcds) if g > 1]
+    by_prime = {}
+    for i in flagged:
+        if gcds[i] != moduli[i]:
+            by_prime.setdefault(gcds[i], set()).add(i)
+    # gcd == n means both primes are shared (or n is duplicated); the flagged
+    # set is small, so resolve those pairwise
+    duplicates = {}
+    for i in flagged:
+        if gcds[i] != moduli[i]:
+            continue
+        for j in flagged:
+            if j == i:
+                continue
+            if moduli[i] == moduli[j]:
+                duplicates.setdefault(moduli[i], set()).update((i, j))
+                continue
+            g = math.gcd(moduli[i], moduli[j])
+            if g > 1:
+                by_prime.setdefault(g, set()).update((i, j))
+    pairs = set()
+    for prime, indices in by_prime.items():
+        members = sorted(indices)
+        for a in range(len(members)):
+            for b in range(a + 1, len(members)):
+                if moduli[members[a]] != moduli[members[b]]:
+                    pairs.add((members[a], members[b], prime))
+    return sorted(pairs), [sorted(group) for group in duplicates.values()]
+
+
+def audit_file(path):
+    t0 = time.perf_counter()
+    moduli = list(read_moduli(path))
+    load_time = time.perf_counter() - t0
+    t0 = time.perf_counter()
+    pairs, duplicates = audit(moduli)
+    return {
+        "moduli": len(moduli),
+        "pairs": pairs,
+        "duplicates": duplicates,
+        "load_seconds": load_time,
+        "audit_seconds": time.perf_counter() - t0,
+        "peak_memory_mb": peak_memory_mb(),
+    }
+
+
+def write_sample(path, count, bits=512, shared=10):
+    # Test data: the last `shared` moduli each reuse a prime from one of the first ones
+    from rsa_keys import random_prime
+
+    primes = [random_prime(bits // 2) for _ in range(2 * count)]
+    moduli = [primes[2 * i] * primes[2 * i + 1] for i in range(count)]
+    for k in range(min(shared, count // 2)):
+        i = count - 1 - k
+        moduli[i] = primes[2 * k] * primes[2 * i + 1]
+    with open(path, "w", encoding="utf-8") as f:
+        for n in moduli:
+            f.write(f"{n}\n")
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Find RSA moduli that share a prime factor (batch GCD)")
+    parser.add_argument("path", help="file with one modulus per line")
+    parser.add_argument("--generate", type=int, metavar="COUNT", help="write a sample file with COUNT moduli first")
+    parser.add_argument("--bits", type=int, default=512)
+    parser.add_argument("--shared", type=int, default=10)
+    args = parser.parse_args()
+
+    if args.generate:
+        write_sample(args.path, args.generate, args.bits, args.shared)
+
+    report = audit_file(args.path)
+    for i, j, prime in report["pairs"]:
+        print(f"moduli #{i} and #{j} share prime {prime}")
+    for group in report["duplicates"]:
+        print(f"identical moduli: {', '.join('#' + str(i) for i in group)}")
+    memory = report["peak_memory_mb"]
+    print(f"{report['moduli']} moduli, {len(report['pairs'])} shared-prime pairs, "
+          f"load {report['load_seconds']:.2f} s, audit {report['audit_seconds']:.2f} s, "
+          f"peak memory {'n/a' if memory is None else f'{memory:.1f} MiB'}")
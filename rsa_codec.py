@@ -0,0 +1,104 @@
+import functools
+import os
+
+# PKCS#1 v1.5 style type-2 padding: 00 02 <non-zero random bytes> 00 <message>
+MIN_PADDING = 8
+OVERHEAD = MIN_PADDING + 3
+
+
+def modulus_bytes(n):
+    return (n.bit_length() + 7) // 8
+
+
+def block_capacity(n):
+    capacity = modulus_bytes(n) - OVERHEAD
+    if capacity < 1:
+        raise ValueError(f"modulus of {n.bit_length()} bits is too small for padded blocks")
+    return capacity
+
+
+def _nonzero_random(length):
+    out = bytearray()
+    while len(out) < length:
+        out += os.urandom(length - len(out) + 8).replace(b'\x00', b'')
+    return bytes(out[:length])
+
+
+def pad_block(chunk, k):
+    padding = _nonzero_random(k - 3 - len(chunk))
+    return b'\x00\x02' + padding + b'\x00' + chunk
+
+
+def unpad_block(block):
+    if block[:2] != b'\x00\x02':
+        raise ValueError("decryption error")
+    sep = block.find(b'\x00', 2)
+    if sep < 2 + MIN_PADDING:
+        raise ValueError("decryption error")
+    return block[sep + 1:]
+
+
+# --- Letter codebooks for the classroom games (A=0 ... Z=25) ---
+ALPHABET_SIZE = 26
+CODEBOOK_CACHE_SIZE = 1024
+
+
+@functools.lru_cache(maxsize=CODEBOOK_CACHE_SIZE)
+def letter_codebook(e, n):
+    return tuple(pow(m, e, n) for m in range(ALPHABET_SIZE))
+
+
+def encrypt_letters(m_values, e, n):
+    book = letter_codebook(e, n)
+    return [book[m] for m in m_values]
+
+
+def encrypt_message(message, e, n):
+    if isinstance(message, str):
+        message = message.encode('utf-8')
+    k = modulus_bytes(n)
+    capacity = block_capacity(n)
+    out = bytearray()
+    for start in range(0, max(len(message), 1), capacity):
+        block = pad_block(message[start:start + capacity], k)
+        c = pow(int.from_bytes(block, 'big'), e, n)
+        out += c.to_bytes(k, 'big')
+    return bytes(out)
+
+
+def decrypt_message(ciphertext, key):
+    k = modulus_bytes(key.n)
+    if len(ciphertext) % k:
+        raise ValueError("ciphertext is not a whole number of blocks")
+    out = bytearray()
+    for start in range(0, len(ciphertext), k):
+        c = int.from_bytes(ciphertext[start:start + k], 'big')
+        if c >= key.n:
+            raise ValueError("decryption error")
+        out += unpad_block(key.decrypt(c).to_bytes(k, 'big'))
+    return bytes(out)
+
+
+if __name__ == "__main__":
+    import time
+    from rsa_keys import generate_keypair
+
+    key = generate_keypair(2048)
+    message = os.urandom(64 * 1024)
+
+    t0 = time.perf_counter()
+    per_byte = [pow(b, key.e, key.n) for b in message[:2048]]
+    per_byte_time = (time.perf_counter() - t0) * len(message) / 2048
+
+    t0 = time.perf_counter()
+    ciphertext = encrypt_message(message, key.e, key.n)
+    block_time = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    assert decrypt_message(ciphertext, key) == message
+    decrypt_time = time.perf_counter() - t0
+
+    print(f"64 KiB message, 2048-bit key, {block_capacity(key.n)} bytes per block")
+    print(f"  one pow() per byte (extrapolated): {per_byte_time:.2f} s, ciphertext {len(message) * modulus_bytes(key.n)} bytes")
+    print(f"  block-packed encrypt:              {block_time:.2f} s, ciphertext {len(ciphertext)} bytes")
+    print(f"  block-packed decrypt (CRT):        {decrypt_time:.2f} s")
@@ -0,0 +1,259 @@
+import math
+import random
+import time
+
+from rsa_keys import is_probable_prime, small_primes_below
+
+TRIAL_LIMIT = 1 << 16
+TRIAL_PRIMES = small_primes_below(TRIAL_LIMIT)
+
+# (B1, curves) per level, roughly following the GMP-ECM tables for 15-30 digit factors
+ECM_LEVELS = [(2000, 25), (11000, 90), (50000, 300), (250000, 700)]
+
+
+class FactorizationTimeout(Exception):
+    def __init__(self, factors, remaining):
+        super().__init__(f"time budget exhausted with {remaining} still composite")
+        self.factors = factors
+        self.remaining = remaining
+
+
+def _check_deadline(deadline):
+    return deadline is not None and time.perf_counter() > deadline
+
+
+# --- Trial division ---
+def trial_division(n, primes=TRIAL_PRIMES):
+    factors = []
+    for p in primes:
+        if p * p > n:
+            break
+        while n % p == 0:
+            factors.append(p)
+            n //= p
+    if 1 < n < primes[-1] ** 2:
+        factors.append(n)
+        n = 1
+    return factors, n
+
+
+# --- Pollard rho, Brent's variant ---
+def pollard_brent(n, deadline=None, progress=None, max_iterations=None, rng=random):
+    if n % 2 == 0:
+        return 2
+    batch = 128
+    while True:
+        y = rng.randrange(1, n)
+        c = rng.randrange(1, n)
+        g = r = q = 1
+        iterations = 0
+        while g == 1:
+            x = y
+            for _ in range(r):
+                y = (y * y + c) % n
+            k = 0
+            while k < r and g == 1:
+                ys = y
+                # Accumulate |x - y| products and take one gcd per batch
+                for _ in range(min(batch, r - k)):
+                    y = (y * y + c) % n
+                    q = q * abs(x - y) % n
+                g = math.gcd(q, n)
+                k += batch
+            iterations += r
+            r *= 2
+            if progress is not None:
+                progress("rho", iterations)
+            if g == 1 and (_check_deadline(deadline) or (max_iterations and iterations >= max_iterations)):
+                return None
+        if g == n:
+            # The batch overshot the collision; step back one iteration at a time
+            while True:
+                ys = (ys * ys + c) % n
+                g = math.gcd(abs(x - ys), n)
+                if g > 1:
+                    break
+        if g != n:
+            return g
+        if _check_deadline(deadline):
+            return None
+
+
+# --- Lenstra ECM on Montgomery curves ---
+def _xdbl(x, z, a24, n):
+    s = (x + z) * (x + z) % n
+    d = (x - z) * (x - z) % n
+    t = s - d
+    return s * d % n, t * (d + a24 * t) % n
+
+
+def _xadd(xp, zp, xq, zq, xd, zd, n):
+    u = (xp - zp) * (xq + zq) % n
+    v = (xp + zp) * (xq - zq) % n
+    s = u + v
+    t = u - v
+    return zd * s * s % n, xd * t * t % n
+
+
+def _ladder(k, x, z, a24, n):
+    x0, z0 = x, z
+    x1, z1 = _xdbl(x, z, a24, n)
+    for bit in bin(k)[3:]:
+        if bit == '1':
+            x0, z0 = _xadd(x0, z0, x1, z1, x, z, n)
+            x1, z1 = _xdbl(x1, z1, a24, n)
+        else:
+            x1, z1 = _xadd(x0, z0, x1, z1, x, z, n)
+            x0, z0 = _xdbl(x0, z0, a24, n)
+    return x0, z0
+
+
+def _suyama_curve(n, rng):
+    # Returns (x, z, a24) or a factor of n found while inverting
+    sigma = rng.randrange(6, n - 1)
+    u = (sigma * sigma - 5) % n
+    v = 4 * sigma % n
+    x = pow(u, 3, n)
+    z = pow(v, 3, n)
+    denominator = 16 * x * v % n
+    g = math.gcd(denominator, n)
+    if g != 1:
+        return g
+    a24 = pow(v - u, 3, n) * (3 * u + v) * pow(denominator, -1, n) % n
+    return x, z, a24
+
+
+def _stage1_multiplier(b1):
+    k = 1
+    for p in small_primes_below(b1 + 1):
+        pk = p
+        while pk * p <= b1:
+            pk *= p
+        k *= pk
+    return k
+
+
+def _stage2(x, z, a24, n, b1, b2, prime_flags, d=210):
+    # Baby steps j*Q for odd j < d, giant steps m*(2d)*Q; X_R*Z_j - X_j*Z_R
+    # vanishes mod p whenever m*2d +/- j hits the order of Q mod p
+    baby = {1: (x, z)}
+    x2, z2 = _xdbl(x, z, a24, n)
+    prev, cur = (x, z), _xadd(x2, z2, x, z, x, z, n)
+    baby[3] = cur
+    for j in range(5, d, 2):
+        nxt = _xadd(cur[0], cur[1], x2, z2, prev[0], prev[1], n)
+        prev, cur = cur, nxt
+        baby[j] = cur
+    step = 2 * d
+    sx, sz = _ladder(step, x, z, a24, n)
+    m = max(2, b1 // step)
+    rx, rz = _ladder(m * step, x, z, a24, n)
+    px, pz = _ladder((m - 1) * step, x, z, a24, n)
+    acc = 1
+    while m * step - d <= b2:
+        centre = m * step
+        for j, (bx, bz) in baby.items():
+            lo, hi = centre - j, centre + j
+            if (b1 < lo <= b2 and prime_flags[lo]) or (b1 < hi <= b2 and prime_flags[hi]):
+                acc = acc * (rx * bz - bx * rz) % n
+        rx, rz, px, pz = (*_xadd(rx, rz, sx, sz, px, pz, n), rx, rz)
+        m += 1
+    return math.gcd(acc, n)
+
+
+def _prime_flags(limit):
+    flags = bytearray([1]) * (limit + 1)
+    flags[0:2] = b'\x00\x00'
+    for i in range(2, math.isqrt(limit) + 1):
+        if flags[i]:
+            flags[i * i::i] = bytes(len(range(i * i, limit + 1, i)))
+    return flags
+
+
+def ecm(n, deadline=None, progress=None, levels=ECM_LEVELS, rng=random):
+    curves_done = 0
+    for b1, curves in levels:
+        b2 = 100 * b1
+        k = _stage1_multiplier(b1)
+        flags = _prime_flags(b2 + 210)
+        for _ in range(curves):
+            if _check_deadline(deadline):
+                return None
+            curve = _suyama_curve(n, rng)
+            if isinstance(curve, int):
+                if curve != n:
+                    return curve
+                continue
+            x, z, a24 = curve
+            qx, qz = _ladder(k, x, z, a24, n)
+            g = math.gcd(qz, n)
+            if g == 1:
+                g = _stage2(qx, qz, a24, n, b1, b2, flags)
+            curves_done += 1
+            if progress is not None:
+                progress("ecm", curves_done)
+            if 1 < g < n:
+                return g
+    return None
+
+
+# --- Driver ---
+def find_factor(n, deadline=None, progress=None):
+    root = math.isqrt(n)
+    if root * root == n:
+        return root
+    # Rho is quickest for small factors; beyond a few million iterations ECM wins
+    rho_budget = None if n.bit_length() <= 64 else 1 << 18
+    g = pollard_brent(n, deadline, progress, max_iterations=rho_budget)
+    if g is None and not _check_deadline(deadline):
+        g = ecm(n, deadline, progress)
+    return g
+
+
+def factorize(n, time_budget=None, progress=None):
+    if n < 1:
+        raise ValueError("n must be positive")
+    deadline = None if time_budget is None else time.perf_counter() + time_budget
+    factors, rest = trial_division(n)
+    stack = [rest] if rest > 1 else []
+    while stack:
+        m = stack.pop()
+        if is_probable_prime(m):
+            factors.append(m)
+            continue
+        g = find_factor(m, deadline, progress)
+        if g is None:
+            raise FactorizationTimeout(sorted(factors), [m] + stack)
+        stack.extend((g, m // g))
+    return sorted(factors)
+
+
+if __name__ == "__main__":
+    import argparse
+    from rsa_keys import random_prime
+
+    parser = argparse.ArgumentParser(description="Factor integers or benchmark on random semiprimes")
+    parser.add_argument("numbers", type=int, nargs="*")
+    parser.add_argument("--budget", type=float, default=None, help="time budget in seconds")
+    parser.add_argument("--bench", type=int, nargs="+", metavar="BITS", help="factor random semiprimes of these sizes")
+    parser.add_argument("--trials", type=int, default=5)
+    args = parser.parse_args()
+
+    for n in args.numbers:
+        t0 = time.perf_counter()
+        try:
+            factors = factorize(n, args.budget)
+            print(f"{n} = {' * '.join(map(str, factors))}  ({time.perf_counter() - t0:.3f} s)")
+        except FactorizationTimeout as exc:
+            print(f"{n}: gave up, found {exc.factors}, composite {exc.remaining}")
+
+    for bits in args.bench or []:
+        total = worst = 0.0
+        for _ in range(args.trials):
+            n = random_prime(bits // 2) * random_prime(bits - bits // 2)
+            t0 = time.perf_counter()
+            factorize(n, args.budget)
+            elapsed = time.perf_counter() - t0
+            total += elapsed
+            worst = max(worst, elapsed)
+        print(f"{bits}-bit semiprimes: mean {total / args.trials:.3f} s, worst {worst:.3f} s")
@@ -0,0 +1,559 @@
+import math
+import multiprocessing
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor, FIRST_COMPLETED, wait
+
+# --- Small primes for trial division ---
+def small_primes_below(limit):
+    sieve = bytearray([1]) * limit
+    sieve[0:2] = b'\x00\x00'
+    for i in range(2, int(limit ** 0.5) + 1):
+        if sieve[i]:
+            sieve[i * i::i] = bytearray(len(range(i * i, limit, i)))
+    return [i for i in range(limit) if sieve[i]]
+
+SMALL_PRIMES = small_primes_below(2000)
+ODD_SMALL_PRIMES = SMALL_PRIMES[1:]
+_HALF_MOD = {p: pow(2, -1, p) for p in ODD_SMALL_PRIMES}
+
+# Bases that make Miller-Rabin deterministic for n < 3317044064679887385961981
+DETERMINISTIC_BASES = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41)
+DETERMINISTIC_LIMIT = 3317044064679887385961981
+
+DEFAULT_E = 65537
+_rng = random.SystemRandom()
+
+
+def gcd(a, b):
+    while b:
+        a, b = b, a % b
+    return a
+
+
+# --- Miller-Rabin ---
+def miller_rabin_rounds(bits):
+    # FIPS 186-4 table C.3 for randomly generated candidates
+    if bits >= 1536:
+        return 3
+    if bits >= 1024:
+        return 4
+    if bits >= 512:
+        return 7
+    if bits >= 256:
+        return 16
+    return 40
+
+
+def _miller_rabin(n, bases):
+    d = n - 1
+    s = 0
+    while d % 2 == 0:
+        d //= 2
+        s += 1
+    for a in bases:
+        a %= n
+        if a in (0, 1, n - 1):
+            continue
+        x = pow(a, d, n)
+        if x == 1 or x == n - 1:
+            continue
+        for _ in range(s - 1):
+            x = x * x % n
+            if x == n - 1:
+                break
+        else:
+            return False
+    return True
+
+
+def is_probable_prime(n, rounds=40):
+    if n < 2:
+        return False
+    for p in SMALL_PRIMES:
+        if n == p:
+            return True
+        if n % p == 0:
+            return False
+    if n < SMALL_PRIMES[-1] ** 2:
+        return True
+    if n < DETERMINISTIC_LIMIT:
+        return _miller_rabin(n, DETERMINISTIC_BASES)
+    bases = [_rng.randrange(2, n - 1) for _ in range(rounds)]
+    return _miller_rabin(n, bases)
+
+
+# --- Baillie-PSW ---
+# Strong base-2 Miller-Rabin plus a strong Lucas test with Selfridge's
+# parameters. Unlike random Miller-Rabin bases it gives the same answer every
+# time, is proven correct below 2^64 and has no known counterexample above.
+def jacobi(a, n):
+    a %= n
+    result = 1
+    while a:
+        while a % 2 == 0:
+            a //= 2
+            if n % 8 in (3, 5):
+                result = -result
+        a, n = n, a
+        if a % 4 == 3 and n % 4 == 3:
+            result = -result
+        a %= n
+    return result if n == 1 else 0
+
+
+def _half(x, n):
+    # x / 2 mod n for odd n
+    return (x + n if x & 1 else x) // 2
+
+
+def _strong_lucas(n):
+    if math.isqrt(n) ** 2 == n:
+        return False
+    D = 5
+    while True:
+        j = jacobi(D, n)
+        if j == -1:
+            break
+        if j == 0 and abs(D) != n:
+            return False
+        D = -D - 2 if D > 0 else -D + 2
+    P, Q = 1, (1 - D) // 4
+    d = n + 1
+    s = 0
+    while d % 2 == 0:
+        d //= 2
+        s += 1
+    # U_k, V_k and Q^k mod n, walking the bits of d from the top
+    U, V, Qk = 1, P, Q % n
+    for bit in bin(d)[3:]:
+        U, V = U * V % n, (V * V - 2 * Qk) % n
+        Qk = Qk * Qk % n
+        if bit == "1":
+            U, V = _half((P * U + V) % n, n), _half((D * U + P * V) % n, n)
+            Qk = Qk * Q % n
+    if U == 0 or V == 0:
+        return True
+    for _ in range(s - 1):
+        V = (V * V - 2 * Qk) % n
+        Qk = Qk * Qk % n
+        if V == 0:
+            return True
+    return False
+
+
+def is_bpsw_prime(n):
+    if n < 2:
+        return False
+    for p in SMALL_PRIMES:
+        if n == p:
+            return True
+        if n % p == 0:
+            return False
+    if n < SMALL_PRIMES[-1] ** 2:
+        return True
+    return _miller_rabin(n, (2,)) and _strong_lucas(n)
+
+
+# --- Prime search ---
+def _new_timings():
+    return {"sieve": 0.0, "miller_rabin": 0.0, "key_assembly": 0.0, "total": 0.0, "candidates": 0, "mr_tests": 0}
+
+
+def random_prime(bits, e=DEFAULT_E, timings=None, rng=_rng, window=None, stop_event=None):
+    if bits < 16:
+        raise ValueError("bits must be at least 16")
+    if e < 3 or e % 2 == 0:
+        # An even e shares the factor 2 with every candidate - 1, so the
+        # search would never end
+        raise ValueError("e must be odd and at least 3")
+    if timings is None:
+        timings = _new_timings()
+    rounds = miller_rabin_rounds(bits)
+    window = window or max(64, bits * 2)
+    while stop_event is None or not stop_event.is_set():
+        t0 = time.perf_counter()
+        # Top two bits set so p*q has exactly 2*bits bits, low bit set for odd
+        start = rng.getrandbits(bits) | (3 << (bits - 2)) | 1
+        # Index i stands for start + 2*i; strike out multiples of each small prime
+        slots = window // 2
+        mask = bytearray([1]) * slots
+        for p in ODD_SMALL_PRIMES:
+            first = (-(start % p) * _HALF_MOD[p]) % p
+            mask[first::p] = bytes(len(range(first, slots, p)))
+        survivors = [start + 2 * i for i in range(slots) if mask[i]]
+        timings["sieve"] += time.perf_counter() - t0
+        timings["candidates"] += slots
+
+        t0 = time.perf_counter()
+        for candidate in survivors:
+            if candidate.bit_length() != bits:
+                break
+            if stop_event is not None and stop_event.is_set():
+                break
+            if gcd(candidate - 1, e) != 1:
+                continue
+            timings["mr_tests"] += 1
+            bases = [rng.randrange(2, candidate - 1) for _ in range(rounds)]
+            if _miller_rabin(candidate, bases):
+                timings["miller_rabin"] += time.perf_counter() - t0
+                return candidate
+        timings["miller_rabin"] += time.perf_counter() - t0
+    return None
+
+
+# --- Parallel prime search ---
+_worker_stop = None
+
+
+def _init_search_worker(stop_event):
+    global _worker_stop
+    _worker_stop = stop_event
+
+
+def _search_prime(bits, e):
+    timings = _new_timings()
+    return random_prime(bits, e, timings, stop_event=_worker_stop), timings
+
+
+def _merge_timings(total, part):
+    for stage, value in part.items():
+        total[stage] += value
+
+
+def parallel_primes(bits, count=2, e=DEFAULT_E, workers=None, timings=None):
+    # Every worker runs its own candidate stream; the first `count` distinct
+    # primes win and the stop event tells the rest to give up.
+    workers = workers or multiprocessing.cpu_count()
+    if timings is None:
+        timings = _new_timings()
+    stop_event = multiprocessing.Event()
+    found = []
+    executor = ProcessPoolExecutor(max_workers=workers, initializer=_init_search_worker, initargs=(stop_event,))
+    try:
+        pending = {executor.submit(_search_prime, bits, e) for _ in range(workers)}
+        while len(found) < count:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                prime, part = future.result()
+                _merge_timings(timings, part)
+                if prime is not None and prime not in found and len(found) < count:
+                    found.append(prime)
+                if len(found) < count:
+                    pending.add(executor.submit(_search_prime, bits, e))
+        stop_event.set()
+    finally:
+        stop_event.set()
+        executor.shutdown(wait=True, cancel_futures=True)
+    return found
+
+
+# --- Key generation ---
+def rsa_keygen(p, q, e=DEFAULT_E):
+    n = p * q
+    phi = (p - 1) * (q - 1)
+    # Toy primes from the games give phi below 65537, so pick a random e there
+    if e is None or e >= phi or gcd(e, phi) != 1:
+        e = random.randrange(2, phi)
+        while gcd(e, phi) != 1:
+            e = random.randrange(2, phi)
+    d = pow(e, -1, phi)
+    return n, phi, e, d
+
+
+class RSAPrivateKey:
+    def __init__(self, n, e, d, p=None, q=None):
+        self.n = n
+        self.e = e
+        self.d = d
+        self.p = p
+        self.q = q
+        if p is not None and q is not None:
+            self.dP = d % (p - 1)
+            self.dQ = d % (q - 1)
+            self.qInv = pow(q, -1, p)
+        else:
+            self.dP = self.dQ = self.qInv = None
+
+    @classmethod
+    def from_primes(cls, p, q, e=DEFAULT_E):
+        n, phi, e, d = rsa_keygen(p, q, e)
+        return cls(n, e, d, p, q)
+
+    @property
+    def phi(self):
+        if self.p is None:
+            return None
+        return (self.p - 1) * (self.q - 1)
+
+    def public_key(self):
+        return self.e, self.n
+
+    def encrypt(self, m):
+        return pow(m, self.e, self.n)
+
+    def decrypt(self, c):
+        if self.qInv is None:
+            return self.decrypt_full(c)
+        # Garner's recombination of the two half-size exponentiations
+        m1 = pow(c % self.p, self.dP, self.p)
+        m2 = pow(c % self.q, self.dQ, self.q)
+        h = self.qInv * (m1 - m2) % self.p
+        return m2 + h * self.q
+
+    def decrypt_full(self, c):
+        return pow(c, self.d, self.n)
+
+    def __repr__(self):
+        return f"RSAPrivateKey(bits={self.n.bit_length()}, e={self.e}, crt={self.qInv is not None})"
+
+
+def generate_keypair(bits=2048, e=DEFAULT_E, timings=None, workers=1):
+    if bits % 2:
+        raise ValueError("modulus size must be even")
+    if e < 3 or e % 2 == 0:
+        raise ValueError("e must be odd and at least 3")
+    if timings is None:
+        timings = _new_timings()
+    start = time.perf_counter()
+    if workers > 1:
+        # Stage timings are then summed over all workers, not wall clock
+        p, q = parallel_primes(bits // 2, 2, e, workers, timings)
+    else:
+        p = random_prime(bits // 2, e, timings)
+        q = random_prime(bits // 2, e, timings)
+        while q == p:
+            q = random_prime(bits // 2, e, timings)
+    t0 = time.perf_counter()
+    key = RSAPrivateKey.from_primes(p, q, e)
+    timings["key_assembly"] += time.perf_counter() - t0
+    timings["total"] += time.perf_counter() - start
+    return key
+
+
+# --- Multi-prime keys ---
+class MultiPrimeRSAKey:
+    def __init__(self, primes, e=DEFAULT_E):
+        if len(primes) < 2 or len(set(primes)) != len(primes):
+            raise ValueError("need at least two distinct primes")
+        self.primes = list(primes)
+        self.n = 1
+        phi = 1
+        for r in self.primes:
+            self.n *= r
+            phi *= r - 1
+        if gcd(e, phi) != 1:
+            raise ValueError("e is not coprime to phi(n)")
+        self.e = e
+        self.d = pow(e, -1, phi)
+        self.exponents = [self.d % (r - 1) for r in self.primes]
+        # Garner coefficients: inverse of r_1 * ... * r_(i-1) modulo r_i
+        self.coefficients = [None]
+        product = self.primes[0]
+        for r in self.primes[1:]:
+            self.coefficients.append(pow(product, -1, r))
+            product *= r
+
+    @property
+    def phi(self):
+        phi = 1
+        for r in self.primes:
+            phi *= r - 1
+        return phi
+
+    def public_key(self):
+        return self.e, self.n
+
+    def encrypt(self, m):
+        return pow(m, self.e, self.n)
+
+    def decrypt(self, c):
+        primes, exponents, coefficients = self.primes, self.exponents, self.coefficients
+        m = pow(c % primes[0], exponents[0], primes[0])
+        product = primes[0]
+        for i in range(1, len(primes)):
+            r = primes[i]
+            h = (pow(c % r, exponents[i], r) - m) * coefficients[i] % r
+            m += product * h
+            product *= r
+        return m
+
+    def decrypt_full(self, c):
+        return pow(c, self.d, self.n)
+
+    def __repr__(self):
+        return f"MultiPrimeRSAKey(bits={self.n.bit_length()}, primes={len(self.primes)}, e={self.e})"
+
+
+def generate_multiprime_keypair(bits=3072, count=3, e=DEFAULT_E, timings=None):
+    if count < 2 or bits // count < 256:
+        raise ValueError("each prime must be at least 256 bits")
+    if timings is None:
+        timings = _new_timings()
+    start = time.perf_counter()
+    sizes = [bits // count + (1 if i < bits % count else 0) for i in range(count)]
+    # Top-two-bit primes only guarantee a leading fraction of (3/4)^count, so
+    # with three or more primes the product can come up one bit short. Once
+    # the first primes are too small no last prime can make up for it, so
+    # redraw the whole set rather than just the last one.
+    while True:
+        primes = [random_prime(size, e, timings) for size in sizes]
+        if len(set(primes)) == count and math.prod(primes).bit_length() == bits:
+            break
+    t0 = time.perf_counter()
+    key = MultiPrimeRSAKey(primes, e)
+    timings["key_assembly"] += time.perf_counter() - t0
+    timings["total"] += time.perf_counter() - start
+    return key
+
+
+def format_timings(timings):
+    lines = [f"  {stage:<13} {timings[stage] * 1000:10.1f} ms" for stage in ("sieve", "miller_rabin", "key_assembly", "total")]
+    lines.append(f"  candidates    {timings['candidates']:10d}")
+    lines.append(f"  mr_tests      {timings['mr_tests']:10d}")
+    return "\n".join(lines)
+
+
+# --- Batch decryption ---
+_batch_key = None
+
+
+def _init_batch_worker(key):
+    global _batch_key
+    _batch_key = key
+
+
+def _decrypt_chunk(ciphertexts):
+    return _decrypt_many(_batch_key, ciphertexts)
+
+
+def _decrypt_many(key, ciphertexts):
+    if isinstance(key, MultiPrimeRSAKey):
+        return [key.decrypt(c) for c in ciphertexts]
+    if key.qInv is None:
+        d, n = key.d, key.n
+        return [pow(c, d, n) for c in ciphertexts]
+    p, q, dP, dQ, qInv = key.p, key.q, key.dP, key.dQ, key.qInv
+    out = []
+    append = out.append
+    for c in ciphertexts:
+        m2 = pow(c % q, dQ, q)
+        append(m2 + qInv * (pow(c % p, dP, p) - m2) % p * q)
+    return out
+
+
+def decrypt_batch(key, ciphertexts, workers=1, chunk_size=256):
+    ciphertexts = list(ciphertexts)
+    if workers <= 1 or len(ciphertexts) <= chunk_size:
+        return _decrypt_many(key, ciphertexts)
+    chunks = [ciphertexts[i:i + chunk_size] for i in range(0, len(ciphertexts), chunk_size)]
+    # The key is shipped once per worker, not once per chunk
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_batch_worker, initargs=(key,)) as executor:
+        out = []
+        for part in executor.map(_decrypt_chunk, chunks):
+            out.extend(part)
+    return out
+
+
+# --- Benchmarks ---
+def benchmark_decrypt(bits=2048, count=100):
+    key = generate_keypair(bits)
+    ciphertexts = [key.encrypt(_rng.randrange(2, key.n)) for _ in range(count)]
+
+    t0 = time.perf_counter()
+    full = [key.decrypt_full(c) for c in ciphertexts]
+    full_time = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    crt = [key.decrypt(c) for c in ciphertexts]
+    crt_time = time.perf_counter() - t0
+
+    if full != crt:
+        raise AssertionError("CRT and full-modulus decryption disagree")
+    return full_time / count, crt_time / count
+
+
+def benchmark_batch_decrypt(bits=2048, sizes=(1, 100, 10000), workers=1):
+    key = generate_keypair(bits)
+    results = {}
+    for size in sizes:
+        ciphertexts = [key.encrypt(_rng.randrange(2, key.n)) for _ in range(size)]
+        t0 = time.perf_counter()
+        decrypt_batch(key, ciphertexts, workers=workers)
+        results[size] = size / (time.perf_counter() - t0)
+    return results
+
+
+def benchmark_multiprime(bits=3072, prime_counts=(2, 3, 4), count=50):
+    results = {}
+    messages = [_rng.randrange(2, 1 << (bits - 1)) for _ in range(count)]
+    for primes in prime_counts:
+        key = generate_keypair(bits) if primes == 2 else generate_multiprime_keypair(bits, primes)
+        ciphertexts = [key.encrypt(m) for m in messages]
+        t0 = time.perf_counter()
+        decrypted = [key.decrypt(c) for c in ciphertexts]
+        results[primes] = (time.perf_counter() - t0) / count
+        if decrypted != messages:
+            raise AssertionError(f"{primes}-prime decryption failed")
+    return results
+
+
+def benchmark_keygen_workers(bits=4096, worker_counts=(1, 2, 4), repeats=3):
+    results = {}
+    for workers in worker_counts:
+        t0 = time.perf_counter()
+        for _ in range(repeats):
+            generate_keypair(bits, workers=workers)
+        results[workers] = (time.perf_counter() - t0) / repeats
+    return results
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Generate RSA keys and report per-stage timings")
+    parser.add_argument("--bits", type=int, nargs="+", default=[1024, 2048, 4096])
+    parser.add_argument("--bench-decrypt", action="store_true", help="compare CRT and full-modulus decryption")
+    parser.add_argument("--count", type=int, default=100)
+    parser.add_argument("--workers", type=int, default=1, help="processes used for the prime search")
+    parser.add_argument("--bench-workers", type=int, nargs="+", metavar="N", help="time keygen for each worker count")
+    parser.add_argument("--bench-batch", type=int, nargs="+", metavar="SIZE", help="batch decrypt throughput per batch size")
+    parser.add_argument("--primes", type=int, default=2, help="number of prime factors in generated keys")
+    parser.add_argument("--bench-multiprime", type=int, nargs="+", metavar="K", help="decrypt time for K-prime keys")
+    args = parser.parse_args()
+
+    # Self-check: every supported prime count gives a full-length modulus
+    # that round-trips
+    for count in range(2, 5):
+        for _ in range(20):
+            key = generate_multiprime_keypair(1024, count)
+            assert key.n.bit_length() == 1024 and len(key.primes) == count
+            assert key.decrypt(key.encrypt(42)) == 42
+    print("multi-prime self-check passed for 2-4 primes")
+
+    for bits in args.bits:
+        if args.bench_multiprime:
+            results = benchmark_multiprime(bits, args.bench_multiprime, args.count)
+            for primes, seconds in results.items():
+                print(f"{bits}-bit {primes}-prime decrypt: {seconds * 1000:.2f} ms (speedup {results[args.bench_multiprime[0]] / seconds:.2f}x)")
+            continue
+        if args.bench_batch:
+            for size, rate in benchmark_batch_decrypt(bits, args.bench_batch, args.workers).items():
+                print(f"{bits}-bit batch decrypt, {size} ciphertexts, {args.workers} worker(s): {rate:.1f} decrypts/s")
+            continue
+        if args.bench_workers:
+            results = benchmark_keygen_workers(bits, args.bench_workers)
+            for workers, seconds in results.items():
+                print(f"{bits}-bit keygen, {workers} worker(s): {seconds:.2f} s (speedup {results[args.bench_workers[0]] / seconds:.2f}x)")
+            continue
+        if args.bench_decrypt:
+            full, crt = benchmark_decrypt(bits, args.count)
+            print(f"{bits}-bit decrypt: full {full * 1000:.2f} ms, CRT {crt * 1000:.2f} ms, speedup {full / crt:.2f}x")
+            continue
+        timings = _new_timings()
+        if args.primes > 2:
+            key = generate_multiprime_keypair(bits, args.primes, timings=timings)
+        else:
+            key = generate_keypair(bits, timings=timings, workers=args.workers)
+        print(f"{bits}-bit key (n has {key.n.bit_length()} bits, e = {key.e})")
+        print(format_timings(timings))
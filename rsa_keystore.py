@@ -0,0 +1,188 @@
+import mmap
+import struct
+import time
+
+from rsa_keys import RSAPrivateKey
+
+# --- File layout ---
+# header: magic, modulus bytes k, record size, key count
+# record: key id (u64), e (u32), reserved (u32), n (k), d (k), p, q, dP, dQ, qInv (k/2 each)
+# Records are sorted by key id so lookups bisect the mapped file directly.
+MAGIC = b"RSAKS\x00\x01\x00"
+HEADER = struct.Struct(">8sIIQ")
+RECORD_PREFIX = struct.Struct(">QII")
+KEY_ID = struct.Struct(">Q")
+
+
+def record_size(modulus_bytes):
+    half = (modulus_bytes + 1) // 2
+    return RECORD_PREFIX.size + 2 * modulus_bytes + 5 * half
+
+
+def pack_record(key_id, key, modulus_bytes):
+    half = (modulus_bytes + 1) // 2
+    if getattr(key, "qInv", None) is None:
+        raise ValueError("key store records need two-prime CRT parameters")
+    if key.e >= 1 << 32:
+        raise ValueError("public exponent does not fit in 32 bits")
+    parts = [RECORD_PREFIX.pack(key_id, key.e, 0), key.n.to_bytes(modulus_bytes, 'big'), key.d.to_bytes(modulus_bytes, 'big')]
+    for value in (key.p, key.q, key.dP, key.dQ, key.qInv):
+        parts.append(value.to_bytes(half, 'big'))
+    return b"".join(parts)
+
+
+def write_keystore(path, keys, modulus_bits=2048):
+    # keys: iterable of (key_id, key); sorted here if not already in id order
+    modulus_bytes = (modulus_bits + 7) // 8
+    items = sorted(keys, key=lambda item: item[0])
+    size = record_size(modulus_bytes)
+    previous = None
+    with open(path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, modulus_bytes, size, len(items)))
+        for key_id, key in items:
+            if key_id == previous:
+                raise ValueError(f"duplicate key id {key_id}")
+            previous = key_id
+            f.write(pack_record(key_id, key, modulus_bytes))
+    return len(items)
+
+
+class KeyStore:
+    def __init__(self, path):
+        self._file = open(path, "rb")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self.modulus_bytes, self.record_size, self.count = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC:
+            self.close()
+            raise ValueError(f"{path} is not an RSA key store")
+        if self.record_size != record_size(self.modulus_bytes):
+            self.close()
+            raise ValueError(f"{path} has an unexpected record size")
+
+    def __len__(self):
+        return self.count
+
+    def __contains__(self, key_id):
+        return self._find(key_id) is not None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _offset(self, index):
+        return HEADER.size + index * self.record_size
+
+    def key_id_at(self, index):
+        return KEY_ID.unpack_from(self._map, self._offset(index))[0]
+
+    def _find(self, key_id):
+        lo, hi = 0, self.count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.key_id_at(mid) < key_id:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < self.count and self.key_id_at(lo) == key_id:
+            return self._offset(lo)
+        return None
+
+    def _fields(self, key_id):
+        offset = self._find(key_id)
+        if offset is None:
+            raise KeyError(key_id)
+        _, e, _ = RECORD_PREFIX.unpack_from(self._map, offset)
+        k = self.modulus_bytes
+        half = (k + 1) // 2
+        pos = offset + RECORD_PREFIX.size
+        n = int.from_bytes(self._map[pos:pos + k], 'big')
+        return e, n, pos + k, half
+
+    def public_key(self, key_id):
+        e, n, _, _ = self._fields(key_id)
+        return e, n
+
+    def get(self, key_id):
+        e, n, pos, half = self._fields(key_id)
+        k = self.modulus_bytes
+        d = int.from_bytes(self._map[pos:pos + k], 'big')
+        pos += k
+        values = []
+        for _ in range(5):
+            values.append(int.from_bytes(self._map[pos:pos + half], 'big'))
+            pos += half
+        p, q, dP, dQ, qInv = values
+        # Fill the CRT fields from the record instead of recomputing them
+        key = RSAPrivateKey.__new__(RSAPrivateKey)
+        key.n, key.e, key.d, key.p, key.q = n, e, d, p, q
+        key.dP, key.dQ, key.qInv = dP, dQ, qInv
+        return key
+
+    def close(self):
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+# --- Benchmark ---
+def _resident_mb():
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * mmap.PAGESIZE / (1024 * 1024)
+    except OSError:
+        return None
+
+
+def write_synthetic_keystore(path, count, modulus_bits=2048):
+    # Real-shaped records built from a handful of keys, for sizing tests;
+    # generating a million genuine 2048-bit keys would take days
+    from rsa_keys import generate_keypair
+
+    modulus_bytes = (modulus_bits + 7) // 8
+    templates = [pack_record(0, generate_keypair(modulus_bits), modulus_bytes) for _ in range(4)]
+    size = record_size(modulus_bytes)
+    with open(path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, modulus_bytes, size, count))
+        for key_id in range(count):
+            f.write(KEY_ID.pack(key_id) + templates[key_id % 4][KEY_ID.size:])
+
+
+if __name__ == "__main__":
+    import argparse
+    import os
+    import random
+
+    parser = argparse.ArgumentParser(description="Measure key store open time, lookups and resident memory")
+    parser.add_argument("path")
+    parser.add_argument("--synthetic", type=int, metavar="COUNT", help="write a synthetic store with COUNT keys first")
+    parser.add_argument("--bits", type=int, default=2048)
+    parser.add_argument("--lookups", type=int, default=100000)
+    args = parser.parse_args()
+
+    if args.synthetic:
+        t0 = time.perf_counter()
+        write_synthetic_keystore(args.path, args.synthetic, args.bits)
+        print(f"wrote {args.synthetic} records in {time.perf_counter() - t0:.1f} s ({os.path.getsize(args.path) / 2 ** 20:.0f} MiB)")
+
+    rss_before = _resident_mb()
+    t0 = time.perf_counter()
+    store = KeyStore(args.path)
+    print(f"opened {len(store)} keys in {(time.perf_counter() - t0) * 1000:.2f} ms")
+    rss_open = _resident_mb()
+
+    ids = [store.key_id_at(random.randrange(len(store))) for _ in range(args.lookups)]
+    t0 = time.perf_counter()
+    for key_id in ids:
+        store.get(key_id)
+    elapsed = time.perf_counter() - t0
+    print(f"{args.lookups} random lookups: {elapsed / args.lookups * 1e6:.1f} us each")
+    rss_after = _resident_mb()
+    if rss_before is not None:
+        # Mapped pages touched by lookups count towards RSS but stay reclaimable page cache
+        print(f"resident memory: {rss_before:.1f} MiB before open, {rss_open:.1f} MiB after open, {rss_after:.1f} MiB after lookups")
+    store.close()
@@ -0,0 +1,125 @@
+import collections
+import multiprocessing
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from rsa_keys import generate_keypair, DEFAULT_E
+
+
+def default_context():
+    # A fresh interpreter (fork server or spawn) rather than a fork of a
+    # process that may have threads or a window open
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+
+
+class KeypairPool:
+    # mode="process" generates keys in a worker process, so the big-number
+    # pow() calls never hold the caller's GIL; the caller needs a __main__
+    # guard, as the worker re-imports it. mode="thread" keeps everything
+    # in-process for callers that cannot have one, at the cost of stalling
+    # the caller's thread while a key is generated.
+    def __init__(self, sizes=(2048,), depth=2, e=DEFAULT_E, mode="process", context=None):
+        if mode not in ("thread", "process"):
+            raise ValueError("mode must be 'thread' or 'process'")
+        self.sizes = tuple(sizes)
+        self.depth = depth
+        self.e = e
+        self.mode = mode
+        self.hits = 0
+        self.misses = 0
+        self.refill_latencies = {bits: collections.deque(maxlen=100) for bits in self.sizes}
+        self._keys = {bits: collections.deque() for bits in self.sizes}
+        self._lock = threading.Lock()
+        self._wakeup = threading.Condition(self._lock)
+        self._stopped = False
+        self._executor = None
+        if mode == "process":
+            self._executor = ProcessPoolExecutor(max_workers=1, mp_context=context or default_context())
+        self._worker = threading.Thread(target=self._refill_loop, name="keypair-pool", daemon=True)
+        self._worker.start()
+
+    def _next_size_to_fill(self):
+        for bits in self.sizes:
+            if len(self._keys[bits]) < self.depth:
+                return bits
+        return None
+
+    def _generate(self, bits):
+        if self._executor is not None:
+            return self._executor.submit(generate_keypair, bits, self.e).result()
+        return generate_keypair(bits, self.e)
+
+    def _refill_loop(self):
+        while True:
+            with self._lock:
+                bits = self._next_size_to_fill()
+                while bits is None and not self._stopped:
+                    self._wakeup.wait()
+                    bits = self._next_size_to_fill()
+                if self._stopped:
+                    return
+            t0 = time.perf_counter()
+            try:
+                key = self._generate(bits)
+            except Exception:
+                if self._stopped:
+                    return
+                raise
+            with self._lock:
+                self.refill_latencies[bits].append(time.perf_counter() - t0)
+                self._keys[bits].append(key)
+
+    def get(self, bits=None):
+        bits = bits or self.sizes[0]
+        with self._lock:
+            keys = self._keys.get(bits)
+            if keys:
+                self.hits += 1
+                key = keys.popleft()
+                self._wakeup.notify()
+                return key
+            self.misses += 1
+            self._wakeup.notify()
+        # Pool empty (or size not pooled): generate on the caller's thread
+        return generate_keypair(bits, self.e)
+
+    def available(self, bits=None):
+        bits = bits or self.sizes[0]
+        with self._lock:
+            return len(self._keys.get(bits, ()))
+
+    def stats(self):
+        with self._lock:
+            refill = {}
+            for bits, samples in self.refill_latencies.items():
+                refill[bits] = {
+                    "last": samples[-1] if samples else None,
+                    "mean": sum(samples) / len(samples) if samples else None,
+                }
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "available": {bits: len(keys) for bits, keys in self._keys.items()},
+                "refill_latency": refill,
+            }
+
+    def close(self):
+        with self._lock:
+            self._stopped = True
+            self._wakeup.notify_all()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+        self._worker.join(timeout=0.1)
+
+
+if __name__ == "__main__":
+    pool = KeypairPool(sizes=(1024, 2048), depth=3)
+    time.sleep(5)
+    for _ in range(5):
+        t0 = time.perf_counter()
+        key = pool.get(2048)
+        print(f"got {key!r} in {(time.perf_counter() - t0) * 1000:.1f} ms")
+    print(pool.stats())
+    pool.close()
@@ -0,0 +1,278 @@
+import asyncio
+import itertools
+import json
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from rsa_keys import generate_keypair, DEFAULT_E
+
+# --- Protocol ---
+# Newline-delimited JSON. Each request carries an "id" that is echoed back, so
+# clients may pipeline: responses arrive in completion order, not send order.
+# Big integers travel as hex strings.
+#   {"id": 1, "op": "keygen", "bits": 2048}            -> {"id": 1, "key_id": 7, "e": "0x10001", "n": "0x..."}
+#   {"id": 2, "op": "public_key", "key_id": 7}         -> {"id": 2, "e": ..., "n": ...}
+#   {"id": 3, "op": "encrypt", "key_id": 7, "m": "0x2a"} -> {"id": 3, "c": ...}
+#   {"id": 4, "op": "decrypt", "key_id": 7, "c": "0x.."} -> {"id": 4, "m": ...}
+#   {"id": 5, "op": "stats"}                           -> {"id": 5, "latency": {...}, ...}
+# Errors come back as {"id": ..., "error": "message"}.
+
+LATENCY_SAMPLES = 10000
+MAX_E = 1 << 32
+
+
+def to_hex(value):
+    return hex(value)
+
+
+def from_hex(value):
+    return int(value, 16) if isinstance(value, str) else int(value)
+
+
+def percentile(samples, fraction):
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def _decrypt_in_worker(key, c):
+    return key.decrypt(c)
+
+
+class RSAService:
+    def __init__(self, workers=None):
+        # Forked workers would inherit open client sockets and keep them from
+        # closing; the fork server starts them from a clean process instead
+        methods = multiprocessing.get_all_start_methods()
+        context = multiprocessing.get_context("forkserver" if "forkserver" in methods else None)
+        self.executor = ProcessPoolExecutor(max_workers=workers or os.cpu_count(), mp_context=context)
+        self.keys = {}
+        self._key_ids = itertools.count(1)
+        self.latencies = {}
+        self.completed = 0
+        self.started = time.perf_counter()
+        self._connections = set()
+
+    def _record(self, op, seconds):
+        samples = self.latencies.setdefault(op, [])
+        if len(samples) >= LATENCY_SAMPLES:
+            del samples[:LATENCY_SAMPLES // 2]
+        samples.append(seconds)
+        self.completed += 1
+
+    def _key(self, request):
+        key_id = request.get("key_id")
+        if key_id not in self.keys:
+            raise KeyError(f"unknown key_id {key_id}")
+        return self.keys[key_id]
+
+    async def handle(self, request):
+        op = request.get("op")
+        loop = asyncio.get_running_loop()
+        if op == "keygen":
+            bits = int(request.get("bits", 2048))
+            if not 512 <= bits <= 8192:
+                raise ValueError("bits must be between 512 and 8192")
+            e = int(request.get("e", DEFAULT_E))
+            if not 3 <= e < MAX_E or e % 2 == 0:
+                raise ValueError("e must be odd and between 3 and 2^32")
+            key = await loop.run_in_executor(self.executor, generate_keypair, bits, e)
+            key_id = next(self._key_ids)
+            self.keys[key_id] = key
+            return {"key_id": key_id, "e": to_hex(key.e), "n": to_hex(key.n)}
+        if op == "public_key":
+            key = self._key(request)
+            return {"e": to_hex(key.e), "n": to_hex(key.n)}
+        if op == "encrypt":
+            # Public-key operations are cheap with e = 65537; run them inline
+            key = self._key(request)
+            return {"c": to_hex(key.encrypt(from_hex(request["m"]) % key.n))}
+        if op == "decrypt":
+            key = self._key(request)
+            m = await loop.run_in_executor(self.executor, _decrypt_in_worker, key, from_hex(request["c"]) % key.n)
+            return {"m": to_hex(m)}
+        if op == "stats":
+            return self.stats()
+        raise ValueError(f"unknown op {op!r}")
+
+    def stats(self):
+        elapsed = time.perf_counter() - self.started
+        return {
+            "completed": self.completed,
+            "throughput": self.completed / elapsed if elapsed else 0.0,
+            "latency": {
+                op: {"p50": percentile(samples, 0.50), "p99": percentile(samples, 0.99), "count": len(samples)}
+                for op, samples in self.latencies.items()
+            },
+        }
+
+    async def _respond(self, request, writer):
+        t0 = time.perf_counter()
+        try:
+            response = await self.handle(request)
+            self._record(request.get("op"), time.perf_counter() - t0)
+        except Exception as exc:
+            response = {"error": str(exc)}
+        response["id"] = request.get("id")
+        writer.write(json.dumps(response).encode("utf-8") + b"\n")
+        await writer.drain()
+
+    async def serve_connection(self, reader, writer):
+        tasks = set()
+        self._connections.add(asyncio.current_task())
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                try:
+                    request = json.loads(line)
+                except ValueError:
+                    request = None
+                if not isinstance(request, dict):
+                    writer.write(b'{"id": null, "error": "malformed request"}\n')
+                    continue
+                task = asyncio.ensure_future(self._respond(request, writer))
+                tasks.add(task)
+                task.add_done_callback(tasks.discard)
+            if tasks:
+                await asyncio.gather(*tasks, return_exceptions=True)
+        finally:
+            self._connections.discard(asyncio.current_task())
+            writer.close()
+
+    async def wait_connections(self, timeout=5.0):
+        if self._connections:
+            await asyncio.wait(self._connections, timeout=timeout)
+
+    def close(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
+
+
+async def start_server(service, host="127.0.0.1", port=8765, unix_path=None):
+    if unix_path:
+        return await asyncio.start_unix_server(service.serve_connection, path=unix_path)
+    return await asyncio.start_server(service.serve_connection, host, port)
+
+
+# --- Load generator ---
+async def _open(host, port, unix_path):
+    if unix_path:
+        return await asyncio.open_unix_connection(unix_path)
+    return await asyncio.open_connection(host, port)
+
+
+async def _client(host, port, unix_path, key_id, requests, pipeline, decrypt_ratio, latencies):
+    reader, writer = await _open(host, port, unix_path)
+    pending = {}
+    window = asyncio.Semaphore(pipeline)
+    done = asyncio.Event()
+    received = 0
+
+    async def read_responses():
+        nonlocal received
+        while received < requests:
+            line = await reader.readline()
+            if not line:
+                break
+            response = json.loads(line)
+            started = pending.pop(response["id"])
+            latencies.append(time.perf_counter() - started)
+            received += 1
+            window.release()
+        done.set()
+
+    reader_task = asyncio.ensure_future(read_responses())
+    for i in range(requests):
+        await window.acquire()
+        if i % 100 < decrypt_ratio * 100:
+            request = {"id": i, "op": "decrypt", "key_id": key_id, "c": to_hex(12345 + i)}
+        else:
+            request = {"id": i, "op": "encrypt", "key_id": key_id, "m": to_hex(12345 + i)}
+        pending[i] = time.perf_counter()
+        writer.write(json.dumps(request).encode("utf-8") + b"\n")
+        await writer.drain()
+    await done.wait()
+    await reader_task
+    writer.close()
+    await writer.wait_closed()
+
+
+async def run_load(host="127.0.0.1", port=8765, unix_path=None, connections=4, requests=500, pipeline=16, bits=2048, decrypt_ratio=0.5):
+    reader, writer = await _open(host, port, unix_path)
+    writer.write(json.dumps({"id": 0, "op": "keygen", "bits": bits}).encode("utf-8") + b"\n")
+    key_id = json.loads(await reader.readline())["key_id"]
+    writer.close()
+    await writer.wait_closed()
+
+    latencies = []
+    t0 = time.perf_counter()
+    await asyncio.gather(*(
+        _client(host, port, unix_path, key_id, requests, pipeline, decrypt_ratio, latencies)
+        for _ in range(connections)
+    ))
+    elapsed = time.perf_counter() - t0
+    return {
+        "requests": len(latencies),
+        "seconds": elapsed,
+        "throughput": len(latencies) / elapsed,
+        "p50": percentile(latencies, 0.50),
+        "p99": percentile(latencies, 0.99),
+    }
+
+
+def _print_load(result):
+    print(f"{result['requests']} requests in {result['seconds']:.2f} s: {result['throughput']:.1f} req/s, "
+          f"p50 {result['p50'] * 1000:.2f} ms, p99 {result['p99'] * 1000:.2f} ms")
+
+
+async def _bench(args):
+    service = RSAService(args.workers)
+    server = await start_server(service, args.host, args.port, args.unix)
+    try:
+        result = await run_load(args.host, args.port, args.unix, args.connections, args.requests, args.pipeline, args.bits, args.decrypt_ratio)
+        _print_load(result)
+        print(json.dumps(service.stats(), indent=2))
+    finally:
+        server.close()
+        await service.wait_connections()
+        await server.wait_closed()
+        service.close()
+
+
+async def _serve(args):
+    service = RSAService(args.workers)
+    server = await start_server(service, args.host, args.port, args.unix)
+    print(f"serving on {args.unix or f'{args.host}:{args.port}'}")
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        service.close()
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Asyncio RSA service and load generator")
+    parser.add_argument("mode", choices=["serve", "load", "bench"], help="bench runs server and load generator in one process")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--unix", metavar="PATH", help="listen on / connect to a Unix socket instead of TCP")
+    parser.add_argument("--workers", type=int, default=None, help="process pool size")
+    parser.add_argument("--connections", type=int, default=4)
+    parser.add_argument("--requests", type=int, default=500, help="requests per connection")
+    parser.add_argument("--pipeline", type=int, default=16, help="requests in flight per connection")
+    parser.add_argument("--bits", type=int, default=2048)
+    parser.add_argument("--decrypt-ratio", type=float, default=0.5)
+    args = parser.parse_args()
+
+    if args.mode == "serve":
+        asyncio.run(_serve(args))
+    elif args.mode == "load":
+        _print_load(asyncio.run(run_load(args.host, args.port, args.unix, args.connections, args.requests, args.pipeline, args.bits, args.decrypt_ratio)))
+    else:
+        asyncio.run(_bench(args))
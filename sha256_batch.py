@@ -0,0 +1,103 @@
+import numpy as np
+
+from sha256_core import H0, K, BLOCK_SIZE, DIGEST_SIZE, padding
+
+# --- Multi-lane SHA-256 ---
+# Every array below has one column per message ("lane"); each compression
+# step runs on all lanes at once. uint32 arithmetic wraps mod 2**32, so no
+# masking is needed anywhere.
+_H0 = np.array(H0, dtype=np.uint32)
+_K = np.array(K, dtype=np.uint32)
+_SHIFTS = {n: (np.uint32(n), np.uint32(32 - n)) for n in (2, 3, 6, 7, 10, 11, 13, 17, 18, 19, 22, 25)}
+DEFAULT_LANES = 1 << 16
+
+
+def _rotr(x, n):
+    right, left = _SHIFTS[n]
+    return (x >> right) | (x << left)
+
+
+def compress_lanes(state, words):
+    # state: (8, lanes) chaining words, words: (16, lanes) message words
+    w = np.empty((64,) + words.shape[1:], dtype=np.uint32)
+    w[:16] = words
+    shift3, shift10 = _SHIFTS[3][0], _SHIFTS[10][0]
+    for t in range(16, 64):
+        x = w[t - 15]
+        y = w[t - 2]
+        s0 = _rotr(x, 7) ^ _rotr(x, 18) ^ (x >> shift3)
+        s1 = _rotr(y, 17) ^ _rotr(y, 19) ^ (y >> shift10)
+        w[t] = w[t - 16] + s0 + w[t - 7] + s1
+
+    a, b, c, d, e, f, g, h = state
+    for t in range(64):
+        s1 = _rotr(e, 6) ^ _rotr(e, 11) ^ _rotr(e, 25)
+        ch = (e & f) ^ (~e & g)
+        temp1 = h + s1 + ch + _K[t] + w[t]
+        s0 = _rotr(a, 2) ^ _rotr(a, 13) ^ _rotr(a, 22)
+        maj = (a & b) ^ (a & c) ^ (b & c)
+        h, g, f, e, d, c, b, a = g, f, e, d + temp1, c, b, a, temp1 + s0 + maj
+
+    return state + np.stack((a, b, c, d, e, f, g, h))
+
+
+def _hash_group(padded):
+    # All messages here pad to the same number of blocks
+    blocks = len(padded[0]) // BLOCK_SIZE
+    words = np.frombuffer(b"".join(padded), dtype=">u4").astype(np.uint32)
+    words = words.reshape(len(padded), blocks, 16).transpose(1, 2, 0)
+    state = np.repeat(_H0[:, None], len(padded), axis=1)
+    for block in range(blocks):
+        state = compress_lanes(state, words[block])
+    raw = state.T.astype(">u4").tobytes()
+    return [raw[i:i + DIGEST_SIZE] for i in range(0, len(raw), DIGEST_SIZE)]
+
+
+def sha256_many(messages, lanes=DEFAULT_LANES):
+    # Returns the digests in input order. Messages are grouped by padded block
+    # count so every lane in a group runs the same number of compressions.
+    groups = {}
+    for index, message in enumerate(messages):
+        padded = bytes(message) + padding(len(message))
+        groups.setdefault(len(padded), []).append((index, padded))
+
+    digests = [None] * sum(len(group) for group in groups.values())
+    for group in groups.values():
+        for start in range(0, len(group), lanes):
+            chunk = group[start:start + lanes]
+            for (index, _), digest in zip(chunk, _hash_group([padded for _, padded in chunk])):
+                digests[index] = digest
+    return digests
+
+
+def sha256_many_hex(messages, lanes=DEFAULT_LANES):
+    return [digest.hex() for digest in sha256_many(messages, lanes)]
+
+
+if __name__ == "__main__":
+    import argparse
+    import hashlib
+    import time
+    from sha256_core import sha256
+
+    parser = argparse.ArgumentParser(description="Benchmark multi-lane NumPy SHA-256 against the pure Python core")
+    parser.add_argument("--words", type=int, default=200000)
+    parser.add_argument("--lanes", type=int, default=DEFAULT_LANES)
+    parser.add_argument("--sample", type=int, default=5000, help="words timed with the pure Python core")
+    args = parser.parse_args()
+
+    words = [f"word{i}".encode() * (1 + i % 20) for i in range(args.words)]
+
+    t0 = time.perf_counter()
+    digests = sha256_many(words, args.lanes)
+    batch = time.perf_counter() - t0
+    assert digests == [hashlib.sha256(w).digest() for w in words]
+
+    sample = words[:args.sample]
+    t0 = time.perf_counter()
+    for w in sample:
+        sha256(w).digest()
+    loop = (time.perf_counter() - t0) * len(words) / len(sample)
+
+    print(f"{len(words)} words: numpy {batch:.2f} s ({len(words) / batch:,.0f}/s), "
+          f"pure Python ~{loop:.2f} s ({len(words) / loop:,.0f}/s), {loop / batch:.1f}x")
@@ -0,0 +1,220 @@
+import hashlib
+import itertools
+import multiprocessing
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+
+# --- Mangling rules ---
+# Candidates are generated lazily: base word forms first, then each form with
+# every digit suffix, so the cheapest guesses go first.
+RULES = ("case", "leet", "digits")
+DEFAULT_RULES = RULES
+LEET = str.maketrans("aeiostAEIOST", "431057431057")
+DIGIT_SUFFIXES = [str(i) for i in range(10)] + [f"{i:02d}" for i in range(100)]
+
+
+def mangle(word, rules=DEFAULT_RULES):
+    forms = [word]
+    if "case" in rules:
+        forms += [word.lower(), word.upper(), word.capitalize()]
+    if "leet" in rules:
+        forms += [form.translate(LEET) for form in forms]
+    forms = list(dict.fromkeys(forms))
+    yield from forms
+    if "digits" in rules:
+        for form in forms:
+            for suffix in DIGIT_SUFFIXES:
+                yield form + suffix
+
+
+def candidates(words, rules=DEFAULT_RULES):
+    for word in words:
+        yield from mangle(word, rules)
+
+
+def _batches(words, size):
+    words = iter(words)
+    while True:
+        batch = list(itertools.islice(words, size))
+        if not batch:
+            return
+        yield batch
+
+
+# --- Workers ---
+_worker_stop = None
+
+
+def _init_crack_worker(stop_event):
+    global _worker_stop
+    _worker_stop = stop_event
+
+
+def _crack_batch(target, words, rules, stop_event=None):
+    # Returns (match or None, candidates hashed); gives up between base words
+    # once another worker has found the answer
+    stop_event = stop_event or _worker_stop
+    sha256 = hashlib.sha256
+    count = 0
+    for word in words:
+        if stop_event is not None and stop_event.is_set():
+            break
+        for candidate in mangle(word, rules):
+            count += 1
+            if sha256(candidate.encode("utf-8")).digest() == target:
+                return candidate, count
+    return None, count
+
+
+def _update(stats, count, t0):
+    stats["candidates"] += count
+    stats["seconds"] = time.perf_counter() - t0
+    stats["rate"] = stats["candidates"] / stats["seconds"] if stats["seconds"] else 0.0
+
+
+# --- Long-lived pool ---
+# For repeated cracks (the game's AI opponent): the worker processes are
+# started once and reused, and come from a fresh interpreter (fork server or
+# spawn) rather than a fork of a process that may have threads or a window.
+def default_context():
+    methods = multiprocessing.get_all_start_methods()
+    return multiprocessing.get_context("forkserver" if "forkserver" in methods else "spawn")
+
+
+class CrackPool:
+    def __init__(self, workers=None, context=None):
+        context = context or default_context()
+        self.workers = workers or multiprocessing.cpu_count()
+        self.stop_event = context.Event()
+        self.executor = ProcessPoolExecutor(max_workers=self.workers, mp_context=context,
+                                            initializer=_init_crack_worker, initargs=(self.stop_event,))
+
+    def close(self):
+        self.stop_event.set()
+        self.executor.shutdown(wait=True, cancel_futures=True)
+
+
+def crack(target, words, rules=DEFAULT_RULES, workers=None, batch_size=500, cancel=None, progress=None, pool=None):
+    # target: hex string or raw digest. Returns (word or None, stats) where
+    # stats has candidates, seconds and rate (hashes per second).
+    # `cancel` is an optional threading.Event; `progress` is called with the
+    # stats dict after every finished batch. With a CrackPool the work always
+    # runs in its processes and `workers` is ignored; one crack at a time.
+    if isinstance(target, str):
+        target = bytes.fromhex(target)
+    workers = pool.workers if pool is not None else workers or multiprocessing.cpu_count()
+    stats = {"candidates": 0, "seconds": 0.0, "rate": 0.0}
+    t0 = time.perf_counter()
+    batches = _batches(words, batch_size)
+
+    if workers == 1 and pool is None:
+        for batch in batches:
+            found, count = _crack_batch(target, batch, rules, cancel)
+            _update(stats, count, t0)
+            if progress:
+                progress(stats)
+            if found is not None or (cancel is not None and cancel.is_set()):
+                return found, stats
+        return None, stats
+
+    if pool is None:
+        stop_event = multiprocessing.Event()
+        executor = ProcessPoolExecutor(max_workers=workers, initializer=_init_crack_worker, initargs=(stop_event,))
+    else:
+        stop_event, executor = pool.stop_event, pool.executor
+        stop_event.clear()
+    found = None
+    pending = set()
+    try:
+        # Two batches in flight per worker keeps everyone busy without
+        # materialising the whole candidate stream
+        pending = {executor.submit(_crack_batch, target, batch, rules) for batch in itertools.islice(batches, 2 * workers)}
+        while pending and found is None:
+            done, pending = wait(pending, timeout=0.1, return_when=FIRST_COMPLETED)
+            if cancel is not None and cancel.is_set():
+                break
+            for future in done:
+                match, count = future.result()
+                _update(stats, count, t0)
+                if match is not None:
+                    found = match
+                    stop_event.set()
+                    break
+                for batch in itertools.islice(batches, 1):
+                    pending.add(executor.submit(_crack_batch, target, batch, rules))
+            if progress:
+                progress(stats)
+    finally:
+        stop_event.set()
+        if pool is None:
+            executor.shutdown(wait=True, cancel_futures=True)
+        else:
+            # Leave the pool idle for the next crack
+            for future in pending:
+                future.cancel()
+            wait(pending)
+    _update(stats, 0, t0)
+    return found, stats
+
+
+# --- Background job (the game's AI opponent) ---
+class CrackJob:
+    def __init__(self, target, words, rules=DEFAULT_RULES, workers=None, pool=None):
+        self.result = None
+        self.stats = {"candidates": 0, "seconds": 0.0, "rate": 0.0}
+        self._cancel = threading.Event()
+        self._thread = threading.Thread(target=self._run, args=(target, list(words), rules, workers, pool), daemon=True)
+        self._thread.start()
+
+    def _run(self, target, words, rules, workers, pool):
+        self.result, self.stats = crack(target, words, rules, workers, cancel=self._cancel, progress=self._progress, pool=pool)
+
+    def _progress(self, stats):
+        self.stats = dict(stats)
+
+    @property
+    def done(self):
+        return not self._thread.is_alive()
+
+    def cancel(self):
+        self._cancel.set()
+        self._thread.join()
+
+
+if __name__ == "__main__":
+    import argparse
+    import random
+
+    parser = argparse.ArgumentParser(description="Dictionary attack against a SHA-256 hex digest")
+    parser.add_argument("target", nargs="?", help="hex digest to crack")
+    parser.add_argument("--wordlist", default="words.txt")
+    parser.add_argument("--word", help="crack the digest of this plaintext instead of TARGET")
+    parser.add_argument("--rules", default=",".join(DEFAULT_RULES), help="comma-separated subset of " + ",".join(RULES))
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--batch-size", type=int, default=500)
+    args = parser.parse_args()
+
+    rules = tuple(rule for rule in args.rules.split(",") if rule)
+    try:
+        with open(args.wordlist, "r", encoding="utf-8") as f:
+            words = [line.strip() for line in f if line.strip()]
+    except FileNotFoundError:
+        words = [f"word{i}" for i in range(20000)]
+        print(f"{args.wordlist} not found, using {len(words)} generated words")
+
+    if args.word:
+        target = hashlib.sha256(args.word.encode("utf-8")).hexdigest()
+    elif args.target:
+        target = args.target
+    else:
+        # Default demo: a mangled word from the end of the list
+        target = hashlib.sha256((random.choice(words[-len(words) // 10:]).capitalize() + "42").encode("utf-8")).hexdigest()
+
+    def report(stats):
+        print(f"\r{stats['candidates']:,} candidates, {stats['rate']:,.0f} H/s", end="", flush=True)
+
+    word, stats = crack(target, words, rules, args.workers, args.batch_size, progress=report)
+    print()
+    print(f"{'found ' + repr(word) if word is not None else 'not found'}: {stats['candidates']:,} candidates "
+          f"in {stats['seconds']:.2f} s ({stats['rate']:,.0f} H/s)")
@@ -0,0 +1,237 @@
+import hashlib
+import mmap
+import os
+import struct
+from concurrent.futures import ProcessPoolExecutor
+
+# --- Tree shape ---
+# Leaves are fixed-size slices of the file; leaf and interior hashes are
+# domain-separated (0x00 / 0x01 prefix) so a leaf can never pose as a node.
+# An odd node at the end of a level is carried up unchanged.
+LEAF_PREFIX = b"\x00"
+NODE_PREFIX = b"\x01"
+DEFAULT_LEAF_SIZE = 1 << 20
+
+# --- Tree file ---
+# header: magic, leaf size, source size, leaf count; then every level's
+# digests from the leaves up to the root
+MAGIC = b"MERKLE01"
+HEADER = struct.Struct(">8sQQQ")
+DIGEST_SIZE = 32
+
+
+def leaf_count(file_size, leaf_size):
+    return max(1, -(-file_size // leaf_size))
+
+
+def node_hash(left, right):
+    return hashlib.sha256(NODE_PREFIX + left + right).digest()
+
+
+def _parent_level(nodes):
+    parents = [node_hash(nodes[i], nodes[i + 1]) for i in range(0, len(nodes) - 1, 2)]
+    if len(nodes) % 2:
+        parents.append(nodes[-1])
+    return parents
+
+
+def _level_sizes(leaves):
+    sizes = [leaves]
+    while sizes[-1] > 1:
+        sizes.append((sizes[-1] + 1) // 2)
+    return sizes
+
+
+# --- Leaf hashing ---
+def _hash_leaf_span(path, leaf_size, first, last):
+    # Hash leaves first..last-1 straight out of a read-only mapping
+    digests = []
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size == 0:
+            return [hashlib.sha256(LEAF_PREFIX).digest()]
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as m:
+            view = memoryview(m)
+            try:
+                for leaf in range(first, last):
+                    hasher = hashlib.sha256(LEAF_PREFIX)
+                    hasher.update(view[leaf * leaf_size:(leaf + 1) * leaf_size])
+                    digests.append(hasher.digest())
+            finally:
+                view.release()
+    return digests
+
+
+def _runs(leaves, max_length):
+    # Sorted leaf indices -> (first, last) ranges of consecutive leaves, none
+    # longer than max_length
+    runs = []
+    for leaf in leaves:
+        if runs and runs[-1][1] == leaf and leaf - runs[-1][0] < max_length:
+            runs[-1][1] = leaf + 1
+        else:
+            runs.append([leaf, leaf + 1])
+    return runs
+
+
+def hash_leaves(path, leaf_size, leaves, workers=1):
+    # Returns {leaf index: digest} for the given sorted leaf indices
+    leaves = list(leaves)
+    result = {}
+    if workers == 1 or len(leaves) < 2:
+        for first, last in _runs(leaves, len(leaves)):
+            result.update(zip(range(first, last), _hash_leaf_span(path, leaf_size, first, last)))
+        return result
+    # Several runs per worker so one slow run does not leave cores idle
+    runs = _runs(leaves, max(1, -(-len(leaves) // (workers * 4))))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [(first, last, executor.submit(_hash_leaf_span, path, leaf_size, first, last)) for first, last in runs]
+        for first, last, future in futures:
+            result.update(zip(range(first, last), future.result()))
+    return result
+
+
+# --- Tree ---
+class MerkleTree:
+    def __init__(self, leaf_size, file_size, levels):
+        self.leaf_size = leaf_size
+        self.file_size = file_size
+        self.levels = levels
+
+    @property
+    def root(self):
+        return self.levels[-1][0]
+
+    def hexroot(self):
+        return self.root.hex()
+
+    @classmethod
+    def build(cls, path, leaf_size=DEFAULT_LEAF_SIZE, workers=1):
+        file_size = os.path.getsize(path)
+        count = leaf_count(file_size, leaf_size)
+        digests = hash_leaves(path, leaf_size, range(count), workers)
+        levels = [[digests[i] for i in range(count)]]
+        while len(levels[-1]) > 1:
+            levels.append(_parent_level(levels[-1]))
+        return cls(leaf_size, file_size, levels)
+
+    def rehash(self, path, ranges, workers=1):
+        # ranges: (offset, length) byte regions that changed since the tree was
+        # built. Only the leaves they touch and the paths above them are
+        # recomputed. Returns the number of leaves re-hashed.
+        file_size = os.path.getsize(path)
+        count = leaf_count(file_size, self.leaf_size)
+        old_count = len(self.levels[0])
+        dirty = set()
+        for offset, length in ranges:
+            first = offset // self.leaf_size
+            last = (offset + max(length, 1) - 1) // self.leaf_size
+            dirty.update(range(first, min(last, count - 1) + 1))
+        if file_size != self.file_size:
+            # The old last leaf may have grown or shrunk, and any new leaves
+            # have no digest yet
+            dirty.update(range(min(old_count, count) - 1, count))
+        digests = hash_leaves(path, self.leaf_size, sorted(dirty), workers)
+
+        leaves = self.levels[0][:count] + [None] * (count - old_count)
+        for leaf, digest in digests.items():
+            leaves[leaf] = digest
+        self.file_size = file_size
+        if count != old_count:
+            # Level sizes changed; interior nodes are cheap next to leaf data
+            self.levels = [leaves]
+            while len(self.levels[-1]) > 1:
+                self.levels.append(_parent_level(self.levels[-1]))
+            return len(digests)
+
+        self.levels[0] = leaves
+        for depth in range(1, len(self.levels)):
+            below = self.levels[depth - 1]
+            level = self.levels[depth]
+            dirty = {index // 2 for index in dirty}
+            for index in dirty:
+                left = 2 * index
+                level[index] = node_hash(below[left], below[left + 1]) if left + 1 < len(below) else below[left]
+        return len(digests)
+
+    def save(self, tree_path):
+        tmp_path = tree_path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(HEADER.pack(MAGIC, self.leaf_size, self.file_size, len(self.levels[0])))
+            for level in self.levels:
+                f.write(b"".join(level))
+        os.replace(tmp_path, tree_path)
+
+    @classmethod
+    def load(cls, tree_path):
+        with open(tree_path, "rb") as f:
+            magic, leaf_size, file_size, count = HEADER.unpack(f.read(HEADER.size))
+            if magic != MAGIC:
+                raise ValueError(f"{tree_path} is not a Merkle tree file")
+            levels = []
+            for size in _level_sizes(count):
+                data = f.read(size * DIGEST_SIZE)
+                if len(data) != size * DIGEST_SIZE:
+                    raise ValueError(f"{tree_path} is truncated")
+                levels.append([data[i:i + DIGEST_SIZE] for i in range(0, len(data), DIGEST_SIZE)])
+        return cls(leaf_size, file_size, levels)
+
+
+if __name__ == "__main__":
+    import argparse
+    import random
+    import tempfile
+    import time
+
+    parser = argparse.ArgumentParser(description="Merkle-tree SHA-256: throughput versus workers and re-hash cost after edits")
+    parser.add_argument("path", nargs="?", help="file to hash (default: a generated one)")
+    parser.add_argument("--size-mb", type=int, default=512)
+    parser.add_argument("--leaf-kb", type=int, default=DEFAULT_LEAF_SIZE // 1024)
+    parser.add_argument("--workers", type=int, nargs="+", default=None)
+    parser.add_argument("--edits", type=int, default=8, help="random small writes before the re-hash")
+    args = parser.parse_args()
+
+    leaf_size = args.leaf_kb * 1024
+    cores = os.cpu_count() or 1
+    worker_counts = args.workers or sorted({n for n in (1, 2, 4, cores) if n <= cores})
+    with tempfile.TemporaryDirectory() as tmp:
+        path = args.path
+        if path is None:
+            path = os.path.join(tmp, "data.bin")
+            with open(path, "wb") as f:
+                block = os.urandom(1 << 20)
+                for _ in range(args.size_mb):
+                    f.write(block)
+        size_mb = os.path.getsize(path) / 2 ** 20
+
+        t0 = time.perf_counter()
+        with open(path, "rb") as f:
+            plain = hashlib.sha256()
+            for chunk in iter(lambda: f.read(1 << 20), b""):
+                plain.update(chunk)
+        print(f"plain sha256: {size_mb / (time.perf_counter() - t0):.0f} MiB/s")
+
+        tree = None
+        for workers in worker_counts:
+            t0 = time.perf_counter()
+            tree = MerkleTree.build(path, leaf_size, workers)
+            elapsed = time.perf_counter() - t0
+            print(f"{workers} worker(s): {size_mb / elapsed:.0f} MiB/s, root {tree.hexroot()[:16]}...")
+
+        tree_path = os.path.join(tmp, "data.merkle")
+        tree.save(tree_path)
+        tree = MerkleTree.load(tree_path)
+
+        if args.path is None:
+            ranges = []
+            with open(path, "r+b") as f:
+                for _ in range(args.edits):
+                    offset = random.randrange(os.path.getsize(path) - 16)
+                    f.seek(offset)
+                    f.write(os.urandom(16))
+                    ranges.append((offset, 16))
+            t0 = time.perf_counter()
+            leaves = tree.rehash(path, ranges)
+            elapsed = time.perf_counter() - t0
+            assert tree.root == MerkleTree.build(path, leaf_size, 1).root
+            print(f"{args.edits} small edits: re-hashed {leaves} of {len(tree.levels[0])} leaves in {elapsed * 1000:.1f} ms")
@@ -0,0 +1,148 @@
+import hashlib
+import itertools
+import multiprocessing
+import queue
+import time
+
+# --- Puzzle ---
+# Find a nonce such that SHA-256(prefix || nonce as 8 big-endian bytes) starts
+# with `bits` zero bits. The prefix is hashed once per worker and every
+# attempt continues from a copy of that midstate, so only the block holding
+# the nonce is compressed per attempt.
+NONCE_BYTES = 8
+CHUNK = 1 << 16
+
+
+def leading_zero_bits(digest):
+    return len(digest) * 8 - int.from_bytes(digest, 'big').bit_length()
+
+
+def check(prefix, nonce, bits):
+    digest = hashlib.sha256(prefix + nonce.to_bytes(NONCE_BYTES, 'big')).digest()
+    return leading_zero_bits(digest) >= bits
+
+
+def _mine_worker(prefix, bits, index, workers, stop_event, results):
+    # Worker `index` scans chunks index, index + workers, ... and reports
+    # (hashes, best bits, best nonce, found nonce) after every chunk
+    midstate = hashlib.sha256(prefix)
+    limit = 1 << (256 - bits)
+    best_value = 1 << 256
+    best_nonce = None
+    for start in itertools.count(index * CHUNK, workers * CHUNK):
+        if stop_event.is_set():
+            return
+        found = None
+        for nonce in range(start, start + CHUNK):
+            h = midstate.copy()
+            h.update(nonce.to_bytes(NONCE_BYTES, 'big'))
+            value = int.from_bytes(h.digest(), 'big')
+            if value < best_value:
+                best_value, best_nonce = value, nonce
+                if value < limit:
+                    found = nonce
+                    break
+        hashes = (found - start + 1) if found is not None else CHUNK
+        results.put((hashes, 256 - best_value.bit_length(), best_nonce, found))
+        if found is not None:
+            stop_event.set()
+            return
+
+
+# --- Miner (pollable from a frame loop) ---
+# `context` picks the start method for the worker processes; a game should pass
+# a fork server or spawn context so workers are not forked from a process with
+# a window and threads running.
+class Miner:
+    def __init__(self, prefix, bits, workers=None, context=None):
+        context = context or multiprocessing.get_context()
+        self.prefix = bytes(prefix)
+        self.bits = bits
+        self.nonce = None
+        self.stats = {"hashes": 0, "seconds": 0.0, "rate": 0.0, "best_bits": 0, "best_nonce": None}
+        self._started = time.perf_counter()
+        self._stop = context.Event()
+        self._results = context.Queue()
+        workers = workers or multiprocessing.cpu_count()
+        self._processes = [
+            context.Process(target=_mine_worker, args=(self.prefix, bits, i, workers, self._stop, self._results), daemon=True)
+            for i in range(workers)
+        ]
+        for process in self._processes:
+            process.start()
+
+    def poll(self):
+        # Drains whatever progress has arrived without ever blocking; call it
+        # once per frame
+        stats = self.stats
+        searching = self.nonce is None
+        while True:
+            try:
+                hashes, best_bits, best_nonce, found = self._results.get_nowait()
+            except queue.Empty:
+                break
+            stats["hashes"] += hashes
+            if best_bits > stats["best_bits"]:
+                stats["best_bits"], stats["best_nonce"] = best_bits, best_nonce
+            if found is not None and self.nonce is None:
+                self.nonce = found
+        if searching:
+            stats["seconds"] = time.perf_counter() - self._started
+            stats["rate"] = stats["hashes"] / stats["seconds"] if stats["seconds"] else 0.0
+        return stats
+
+    @property
+    def done(self):
+        return self.nonce is not None or self._stop.is_set()
+
+    def digest(self):
+        if self.nonce is None:
+            return None
+        return hashlib.sha256(self.prefix + self.nonce.to_bytes(NONCE_BYTES, 'big')).hexdigest()
+
+    def cancel(self, timeout=1.0):
+        # Workers notice the stop flag between chunks; anything still running
+        # after the timeout is terminated
+        self._stop.set()
+        deadline = time.perf_counter() + timeout
+        for process in self._processes:
+            process.join(max(0.0, deadline - time.perf_counter()))
+            if process.is_alive():
+                process.terminate()
+                process.join()
+        self._results.cancel_join_thread()
+        self._results.close()
+
+
+def mine(prefix, bits, workers=None, progress=None, interval=0.5, context=None):
+    miner = Miner(prefix, bits, workers, context)
+    try:
+        while miner.nonce is None:
+            time.sleep(interval)
+            stats = miner.poll()
+            if progress:
+                progress(stats)
+    finally:
+        miner.cancel()
+    return miner.nonce, miner.stats
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Proof-of-work nonce search over SHA-256")
+    parser.add_argument("prefix", nargs="?", default="hash")
+    parser.add_argument("--bits", type=int, default=22)
+    parser.add_argument("--workers", type=int, nargs="+", default=[multiprocessing.cpu_count()])
+    parser.add_argument("--start-method", choices=multiprocessing.get_all_start_methods(), default=None)
+    args = parser.parse_args()
+    context = multiprocessing.get_context(args.start_method)
+
+    def report(stats):
+        print(f"\r{stats['hashes']:,} hashes, {stats['rate']:,.0f} H/s, best {stats['best_bits']} bits", end="", flush=True)
+
+    for workers in args.workers:
+        nonce, stats = mine(args.prefix.encode("utf-8"), args.bits, workers, report, context=context)
+        assert check(args.prefix.encode("utf-8"), nonce, args.bits)
+        print(f"\n{workers} worker(s): nonce {nonce} after {stats['hashes']:,} hashes in {stats['seconds']:.2f} s "
+              f"({stats['rate']:,.0f} H/s)")
@@ -0,0 +1,107 @@
+import os
+import struct
+
+from sha256_core import SHA256
+
+# --- Checkpoint file ---
+# header: magic, source size, source mtime (ns); then SHA256.export_state().
+# The byte count inside the state is the offset to resume reading from.
+MAGIC = b"SHACKPT1"
+HEADER = struct.Struct(">8sQQ")
+DEFAULT_CHECKPOINT_MB = 64
+READ_SIZE = 1 << 20
+
+
+def checkpoint_path_for(path):
+    return path + ".sha256ckpt"
+
+
+def _source_stamp(path):
+    st = os.stat(path)
+    return st.st_size, st.st_mtime_ns
+
+
+def save_checkpoint(checkpoint_path, hasher, stamp):
+    tmp_path = checkpoint_path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, *stamp))
+        f.write(hasher.export_state())
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, checkpoint_path)
+
+
+def load_checkpoint(checkpoint_path, stamp):
+    # None when there is no usable checkpoint, including when the source file
+    # has changed since it was written
+    try:
+        with open(checkpoint_path, "rb") as f:
+            blob = f.read()
+        magic, size, mtime = HEADER.unpack_from(blob)
+        if magic != MAGIC or (size, mtime) != stamp:
+            return None
+        return SHA256.from_state(blob[HEADER.size:])
+    except (OSError, struct.error, ValueError):
+        return None
+
+
+def hash_file_resumable(path, checkpoint_path=None, checkpoint_mb=DEFAULT_CHECKPOINT_MB, stop_after=None, progress=None):
+    # Returns the hex digest, or None if stopped after `stop_after` bytes of
+    # this run (for testing interruption). The checkpoint is removed once the
+    # digest is known.
+    checkpoint_path = checkpoint_path or checkpoint_path_for(path)
+    stamp = _source_stamp(path)
+    hasher = load_checkpoint(checkpoint_path, stamp) or SHA256()
+    offset = hasher.bytes_hashed
+    checkpoint_every = checkpoint_mb << 20
+    next_checkpoint = offset + checkpoint_every
+    read_this_run = 0
+    buf = bytearray(READ_SIZE)
+    view = memoryview(buf)
+    with open(path, "rb", buffering=0) as f:
+        f.seek(offset)
+        while True:
+            count = f.readinto(buf)
+            if not count:
+                break
+            hasher.update(view[:count])
+            offset += count
+            read_this_run += count
+            if offset >= next_checkpoint:
+                save_checkpoint(checkpoint_path, hasher, stamp)
+                next_checkpoint = offset + checkpoint_every
+                if progress:
+                    progress(offset, stamp[0])
+            if stop_after is not None and read_this_run >= stop_after:
+                save_checkpoint(checkpoint_path, hasher, stamp)
+                return None
+    digest = hasher.hexdigest()
+    if os.path.exists(checkpoint_path):
+        os.remove(checkpoint_path)
+    return digest
+
+
+if __name__ == "__main__":
+    import argparse
+    import sys
+
+    parser = argparse.ArgumentParser(description="SHA-256 of large files, resuming from the last checkpoint automatically")
+    parser.add_argument("paths", nargs="+")
+    parser.add_argument("--checkpoint-mb", type=int, default=DEFAULT_CHECKPOINT_MB, help="write a checkpoint every N MiB")
+    parser.add_argument("--stop-after-mb", type=int, default=None, help="stop (with a checkpoint) after hashing N MiB this run")
+    args = parser.parse_args()
+
+    def report(offset, total):
+        print(f"\r{offset / 2 ** 20:.0f}/{total / 2 ** 20:.0f} MiB", end="", file=sys.stderr, flush=True)
+
+    for path in args.paths:
+        resumed = load_checkpoint(checkpoint_path_for(path), _source_stamp(path))
+        if resumed is not None:
+            print(f"resuming {path} at {resumed.bytes_hashed / 2 ** 20:.1f} MiB", file=sys.stderr)
+        stop_after = args.stop_after_mb << 20 if args.stop_after_mb is not None else None
+        digest = hash_file_resumable(path, checkpoint_mb=args.checkpoint_mb, stop_after=stop_after, progress=report)
+        print(file=sys.stderr)
+        if digest is None:
+            print(f"stopped {path}; run again to resume", file=sys.stderr)
+        else:
+            print(f"{digest}  {path}")
@@ -0,0 +1,172 @@
+import hashlib
+import mmap
+import os
+import struct
+
+# --- File layout ---
+# header: magic, source mtime (ns), source size, source SHA-256, record count, word width
+# record: SHA-256 digest of the word (32), word as UTF-8 padded with NULs to the width
+# Records are sorted by digest so lookups bisect the mapped file directly.
+MAGIC = b"WORDIDX\x01"
+HEADER = struct.Struct(">8sQQ32sQI")
+DIGEST_SIZE = 32
+
+
+def read_wordlist(path):
+    # Same normalisation as the game's load_words, without duplicates
+    with open(path, "r", encoding="utf-8") as f:
+        return list(dict.fromkeys(line.strip().lower() for line in f if line.strip()))
+
+
+def file_digest(path, chunk_size=1 << 20):
+    hasher = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            hasher.update(chunk)
+    return hasher.digest()
+
+
+def _stamp(path):
+    st = os.stat(path)
+    return st.st_mtime_ns, st.st_size
+
+
+def build_index(words_path, index_path):
+    mtime, size = _stamp(words_path)
+    source_digest = file_digest(words_path)
+    encoded = [word.encode("utf-8") for word in read_wordlist(words_path)]
+    records = sorted((hashlib.sha256(word).digest(), word) for word in encoded)
+    width = max((len(word) for word in encoded), default=0)
+    tmp_path = index_path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, mtime, size, source_digest, len(records), width))
+        for digest, word in records:
+            f.write(digest + word.ljust(width, b"\x00"))
+    os.replace(tmp_path, index_path)
+    return len(records)
+
+
+def _read_header(index_path):
+    try:
+        with open(index_path, "rb") as f:
+            fields = HEADER.unpack(f.read(HEADER.size))
+    except (OSError, struct.error):
+        return None
+    return fields if fields[0] == MAGIC else None
+
+
+def refresh_index(words_path, index_path):
+    # Cheap stat check first; a touched but unchanged file only gets its stamp
+    # updated, anything else is rebuilt
+    header = _read_header(index_path)
+    mtime, size = _stamp(words_path)
+    if header is not None and header[1:3] == (mtime, size):
+        return False
+    if header is not None and header[2] == size and header[3] == file_digest(words_path):
+        with open(index_path, "r+b") as f:
+            f.write(HEADER.pack(MAGIC, mtime, size, header[3], header[4], header[5]))
+        return False
+    build_index(words_path, index_path)
+    return True
+
+
+class WordIndex:
+    def __init__(self, path):
+        self._file = open(path, "rb")
+        self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, _, _, _, self.count, self.width = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC:
+            self.close()
+            raise ValueError(f"{path} is not a word index")
+        self.record_size = DIGEST_SIZE + self.width
+
+    def __len__(self):
+        return self.count
+
+    def __contains__(self, digest):
+        return self.lookup(digest) is not None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _offset(self, index):
+        return HEADER.size + index * self.record_size
+
+    def digest_at(self, index):
+        offset = self._offset(index)
+        return self._map[offset:offset + DIGEST_SIZE]
+
+    def word_at(self, index):
+        offset = self._offset(index) + DIGEST_SIZE
+        return self._map[offset:offset + self.width].rstrip(b"\x00").decode("utf-8")
+
+    def record(self, index):
+        return self.word_at(index), self.digest_at(index).hex()
+
+    def lookup(self, digest):
+        # digest: 32 raw bytes or a 64-character hex string
+        if isinstance(digest, str):
+            digest = bytes.fromhex(digest)
+        lo, hi = 0, self.count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.digest_at(mid) < digest:
+                lo = mid + 1
+            else:
+                hi = mid
+        if lo < self.count and self.digest_at(lo) == digest:
+            return self.word_at(lo)
+        return None
+
+    def close(self):
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+def open_index(words_path, index_path=None):
+    index_path = index_path or words_path + ".idx"
+    refresh_index(words_path, index_path)
+    return WordIndex(index_path)
+
+
+if __name__ == "__main__":
+    import argparse
+    import random
+    import tempfile
+    import time
+
+    parser = argparse.ArgumentParser(description="Build a digest -> word index and time lookups")
+    parser.add_argument("words", nargs="?", help="word list (default: a generated one)")
+    parser.add_argument("--count", type=int, default=300000, help="size of the generated word list")
+    parser.add_argument("--lookups", type=int, default=100000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        words_path = args.words
+        if words_path is None:
+            words_path = os.path.join(tmp, "words.txt")
+            with open(words_path, "w", encoding="utf-8") as f:
+                f.writelines(f"word{i}\n" for i in range(args.count))
+        index_path = os.path.join(tmp, "words.idx")
+
+        t0 = time.perf_counter()
+        build_index(words_path, index_path)
+        print(f"built in {time.perf_counter() - t0:.2f} s ({os.path.getsize(index_path) / 2 ** 20:.1f} MiB)")
+        t0 = time.perf_counter()
+        index = open_index(words_path, index_path)
+        print(f"reopened unchanged list in {(time.perf_counter() - t0) * 1000:.2f} ms, {len(index)} words")
+
+        targets = [index.digest_at(random.randrange(len(index))) for _ in range(args.lookups)]
+        t0 = time.perf_counter()
+        for digest in targets:
+            assert index.lookup(digest) is not None
+        elapsed = time.perf_counter() - t0
+        print(f"{args.lookups} lookups: {elapsed / args.lookups * 1e6:.1f} us each")
+        index.close()